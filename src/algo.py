@@ -1,11 +1,39 @@
 import numpy as np
-import networkx as nx
 from datetime import datetime
 from collections import deque
 
+# Deployment
+from src.bitboard import bitboard_backtracking_dfs, bitboard_greedy_dfs, bitboard_forced_move_dfs, bitboard_edge_elimination_dfs, bitboard_validation_forced_move_dfs, bitboard_validation_edge_elimination_dfs
+from src.connectivity import ArticulationValidator
+from src.construct import constructive_solve
+from src.decompose import split_solve
+from src.grid import GridGraph
+from src.lowmem import lowmem_backtracking_dfs, lowmem_greedy_dfs, lowmem_forced_move_dfs, lowmem_edge_elimination_dfs, lowmem_validation_forced_move_dfs, lowmem_validation_edge_elimination_dfs
+from src.ordering import order_candidates, resolve_tie_break
+from src.parallel import parallel_forced_move_dfs, parallel_edge_elimination_dfs, parallel_validation_forced_move_dfs, parallel_validation_edge_elimination_dfs
+from src.precheck import precheck_board
+from src.restart import restart_solve
+from src.stats import collect_stats
+from src.trail import trail_backtracking_dfs, trail_greedy_dfs, trail_forced_move_dfs, trail_edge_elimination_dfs, trail_validation_forced_move_dfs, trail_validation_edge_elimination_dfs, trail_propagation_dfs, trail_solutions, trail_count_solutions
+# Local testing
+# from bitboard import bitboard_backtracking_dfs, bitboard_greedy_dfs, bitboard_forced_move_dfs, bitboard_edge_elimination_dfs, bitboard_validation_forced_move_dfs, bitboard_validation_edge_elimination_dfs
+# from connectivity import ArticulationValidator
+# from construct import constructive_solve
+# from decompose import split_solve
+# from grid import GridGraph
+# from lowmem import lowmem_backtracking_dfs, lowmem_greedy_dfs, lowmem_forced_move_dfs, lowmem_edge_elimination_dfs, lowmem_validation_forced_move_dfs, lowmem_validation_edge_elimination_dfs
+# from ordering import order_candidates, resolve_tie_break
+# from parallel import parallel_forced_move_dfs, parallel_edge_elimination_dfs, parallel_validation_forced_move_dfs, parallel_validation_edge_elimination_dfs
+# from precheck import precheck_board
+# from restart import restart_solve
+# from stats import collect_stats
+# from trail import trail_backtracking_dfs, trail_greedy_dfs, trail_forced_move_dfs, trail_edge_elimination_dfs, trail_validation_forced_move_dfs, trail_validation_edge_elimination_dfs, trail_propagation_dfs, trail_solutions, trail_count_solutions
+
 # Convert Matrix to Graph
 
 def get_graph_from_binary_matrix(mat):
+    import networkx as nx   # only this builder needs it; GridGraph boards never load networkx
+
     arr = np.array(mat, dtype=int)
     rows, cols = arr.shape
     
@@ -32,9 +60,33 @@ def get_graph_from_binary_matrix(mat):
     return G, start
 
 
+def get_grid_from_binary_matrix(mat):
+    return GridGraph.from_matrix(np.array(mat, dtype=int))
+
+
 # First Algorithm (backtracking)
 
-def backtracking_dfs(G, start):
+@collect_stats
+def backtracking_dfs(G, start, engine="graph", memo=None, precheck=True, construct=True, split=False, budget=None, stats=None):
+    if precheck and precheck_board(G, start):
+        if stats is not None:
+            stats.shortcut = "precheck"
+        return [], False, None, "0.000000 s (0.000 ms)"
+    if construct:
+        result = constructive_solve(G, start)
+        if result:
+            if stats is not None:
+                stats.shortcut = "construct"
+            return result
+    if split:
+        return split_solve(G, start, backtracking_dfs, engine=engine, memo=memo, precheck=precheck, construct=construct, budget=budget, stats=stats)
+    if engine == "bitboard" and memo is None:
+        return bitboard_backtracking_dfs(G, start, budget=budget, stats=stats)
+    if engine == "lowmem" and memo is None:
+        return lowmem_backtracking_dfs(G, start, budget=budget, stats=stats)
+    if engine in ("trail", "parallel") or memo is not None:   # no parallel variant
+        return trail_backtracking_dfs(G, start, memo=memo, budget=budget, stats=stats)
+
     time_start = datetime.now()
     total_nodes = len(G.nodes())
 
@@ -48,6 +100,11 @@ def backtracking_dfs(G, start):
     while stack:
         node, path, visited = stack.pop()
 
+        if budget is not None and budget.spend(len(path)):
+            break
+        if stats is not None:
+            stats.peak_stack = max(stats.peak_stack, len(stack) + 1)
+
         if len(path) == total_nodes:
             solution_path = path
             finished = True
@@ -68,8 +125,31 @@ def backtracking_dfs(G, start):
 
 # Second Algorithm (backtracking + greedy)
 
-def greedy_dfs(G, start):
+@collect_stats
+def greedy_dfs(G, start, engine="graph", memo=None, ordering="degree", tie_break=None, precheck=True, construct=True, split=False, restarts=None, budget=None, stats=None):
+    if precheck and precheck_board(G, start):
+        if stats is not None:
+            stats.shortcut = "precheck"
+        return [], False, None, "0.000000 s (0.000 ms)"
+    if construct:
+        result = constructive_solve(G, start)
+        if result:
+            if stats is not None:
+                stats.shortcut = "construct"
+            return result
+    if split:
+        return split_solve(G, start, greedy_dfs, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=precheck, construct=construct, restarts=restarts, budget=budget, stats=stats)
+    if restarts:
+        return restart_solve(G, start, greedy_dfs, restarts=restarts, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=False, construct=False, budget=budget, stats=stats)
+    if engine == "bitboard" and memo is None:
+        return bitboard_greedy_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "lowmem" and memo is None:
+        return lowmem_greedy_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine in ("trail", "parallel") or memo is not None:   # no parallel variant
+        return trail_greedy_dfs(G, start, memo=memo, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
     time_start = datetime.now()
+    tie = resolve_tie_break(tie_break, start, G.nodes())
     total_nodes = len(G.nodes())
 
     solution_path = []
@@ -82,6 +162,11 @@ def greedy_dfs(G, start):
     while stack:
         node, path, visited = stack.pop()
 
+        if budget is not None and budget.spend(len(path)):
+            break
+        if stats is not None:
+            stats.peak_stack = max(stats.peak_stack, len(stack) + 1)
+
         if len(path) == total_nodes:
             solution_path = path
             finished = True
@@ -89,7 +174,7 @@ def greedy_dfs(G, start):
             break
 
         neighbors = [nb for nb in G.neighbors(node) if nb not in visited]
-        neighbors.sort(key=lambda x: G.degree(x), reverse=True)
+        neighbors = order_candidates(G, neighbors, visited, ordering, tie)
 
         for nb in neighbors:
             if nb not in visited:
@@ -105,8 +190,33 @@ def greedy_dfs(G, start):
 
 # Third Algorithm (backtracking + greedy + forced move)
 
-def forced_move_dfs(G, start):
+@collect_stats
+def forced_move_dfs(G, start, engine="graph", memo=None, ordering="degree", tie_break=None, precheck=True, construct=True, split=False, restarts=None, budget=None, stats=None):
+    if precheck and precheck_board(G, start):
+        if stats is not None:
+            stats.shortcut = "precheck"
+        return [], False, None, "0.000000 s (0.000 ms)"
+    if construct:
+        result = constructive_solve(G, start)
+        if result:
+            if stats is not None:
+                stats.shortcut = "construct"
+            return result
+    if split:
+        return split_solve(G, start, forced_move_dfs, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=precheck, construct=construct, restarts=restarts, budget=budget, stats=stats)
+    if restarts:
+        return restart_solve(G, start, forced_move_dfs, restarts=restarts, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=False, construct=False, budget=budget, stats=stats)
+    if engine == "bitboard" and memo is None:
+        return bitboard_forced_move_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "lowmem" and memo is None:
+        return lowmem_forced_move_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "parallel" and memo is None:
+        return parallel_forced_move_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "trail" or memo is not None:
+        return trail_forced_move_dfs(G, start, memo=memo, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
     time_start = datetime.now()
+    tie = resolve_tie_break(tie_break, start, G.nodes())
     total_nodes = len(G.nodes())
 
     solution_path = []
@@ -119,6 +229,12 @@ def forced_move_dfs(G, start):
     while stack:
         node, path, visited = stack.pop()
 
+        if budget is not None and budget.spend(len(path)):
+            break
+        if stats is not None:
+            stats.peak_stack = max(stats.peak_stack, len(stack) + 1)
+            depth_before = len(path)
+
         forced = True
         while forced:
             forced = False
@@ -142,6 +258,9 @@ def forced_move_dfs(G, start):
                     forced = True
                     break
 
+        if stats is not None:
+            stats.forced_moves += len(path) - depth_before
+
         if len(path) == total_nodes:
             solution_path = path
             finished = True
@@ -149,7 +268,7 @@ def forced_move_dfs(G, start):
             break
 
         neighbors = [nb for nb in G.neighbors(node) if nb not in visited]
-        neighbors.sort(key=lambda x: G.degree(x), reverse=True)
+        neighbors = order_candidates(G, neighbors, visited, ordering, tie)
 
         for nb in neighbors:
             if nb not in visited:
@@ -165,33 +284,58 @@ def forced_move_dfs(G, start):
 
 # Fourth Algorithm (backtracking + greedy + edge elimination)
 
-def edge_elimination_dfs(G, start):
+@collect_stats
+def edge_elimination_dfs(G, start, engine="graph", memo=None, ordering="degree", tie_break=None, precheck=True, construct=True, split=False, restarts=None, budget=None, stats=None):
+    if precheck and precheck_board(G, start):
+        if stats is not None:
+            stats.shortcut = "precheck"
+        return [], False, None, "0.000000 s (0.000 ms)"
+    if construct:
+        result = constructive_solve(G, start)
+        if result:
+            if stats is not None:
+                stats.shortcut = "construct"
+            return result
+    if split:
+        return split_solve(G, start, edge_elimination_dfs, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=precheck, construct=construct, restarts=restarts, budget=budget, stats=stats)
+    if restarts:
+        return restart_solve(G, start, edge_elimination_dfs, restarts=restarts, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=False, construct=False, budget=budget, stats=stats)
+    if engine == "bitboard" and memo is None:
+        return bitboard_edge_elimination_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "lowmem" and memo is None:
+        return lowmem_edge_elimination_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "parallel" and memo is None:
+        return parallel_edge_elimination_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "trail" or memo is not None:
+        return trail_edge_elimination_dfs(G, start, memo=memo, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
     time_start = datetime.now()
+    tie = resolve_tie_break(tie_break, start, G.nodes())
     total_nodes = len(G.nodes())
 
     solution_path = []
     finished = False
     finish_node = None
 
-    nx.set_node_attributes(G, {n: G.degree(n) for n in G.nodes()}, "degree_value")
-    nx.set_node_attributes(G, {n: 0 for n in G.nodes()}, "edge_value")
+    # Propagation state lives in this call, so G is never written to
+    degree_value = {n: G.degree(n) for n in G.nodes()}
+    edge_value = dict.fromkeys(G.nodes(), 0)
 
-    remove_list = []
-    append_list = []
+    root_removals = []   # queued by the setup, propagated with the root entry
 
     visited_edge = set()
     for node in list(G.nodes()):
-        required_degree = 1 if (node == start or G.nodes[node]["degree_value"] == 1) else 2
-        if G.nodes[node]["degree_value"] == required_degree:
-            G.nodes[node]["edge_value"] = required_degree
+        required_degree = 1 if (node == start or degree_value[node] == 1) else 2
+        if degree_value[node] == required_degree:
+            edge_value[node] = required_degree
             neighbors = list(G.neighbors(node))
             for nb in neighbors:
                 visited_edge.add(tuple(sorted((node, nb))))
                 required_degree = 1 if (nb == start or G.degree(nb) == 1) else 2
-                if G.nodes[nb]["edge_value"] < required_degree:
-                    G.nodes[nb]["edge_value"] += 1
-                if G.nodes[nb]["edge_value"] == required_degree and G.nodes[nb]["degree_value"] > required_degree:
-                    remove_list.append(nb)
+                if edge_value[nb] < required_degree:
+                    edge_value[nb] += 1
+                if edge_value[nb] == required_degree and degree_value[nb] > required_degree:
+                    root_removals.append(nb)
 
     stack = deque()
     stack.append((start, [start], {start}, visited_edge, {None}))   # (node sekarang, path, visited node, visited edge, removed edge)
@@ -199,6 +343,16 @@ def edge_elimination_dfs(G, start):
     while stack:
         node, path, visited_node, visited_edge, removed_edge = stack.pop()
 
+        if budget is not None and budget.spend(len(path)):
+            break
+        if stats is not None:
+            stats.peak_stack = max(stats.peak_stack, len(stack) + 1)
+            depth_before = len(path)
+
+        # Each entry propagates with its own queues, so a rejected state leaves nothing behind
+        remove_list, append_list = root_removals, []
+        root_removals = []
+
         step = True
         while remove_list or step:
             step = False
@@ -219,14 +373,14 @@ def edge_elimination_dfs(G, start):
                     edge = tuple(sorted((node_list, nb)))
                     if edge not in visited_edge:
                         removed_edge.add(edge)
-                        G.nodes[node_list]["degree_value"] -= 1
+                        degree_value[node_list] -= 1
 
-                        required_degree = 1 if (nb == start or G.nodes[nb]["degree_value"] == 1) else 2
-                        if G.nodes[nb]["degree_value"] > required_degree:
-                            G.nodes[nb]["degree_value"] -= 1
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if degree_value[nb] > required_degree:
+                            degree_value[nb] -= 1
 
-                        required_degree = 1 if (nb == start or G.nodes[nb]["degree_value"] == 1) else 2
-                        if G.nodes[nb]["degree_value"] == required_degree:
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if degree_value[nb] == required_degree:
                             append_list.append(nb)
 
             while append_list:
@@ -237,14 +391,17 @@ def edge_elimination_dfs(G, start):
                     if edge not in removed_edge:
                         step = True
                         visited_edge.add(edge)
-                        required_degree = 1 if (node_list == start or G.nodes[node_list]["degree_value"] == 1) else 2
-                        G.nodes[node_list]["edge_value"] = required_degree
-                        required_degree = 1 if (nb == start or G.nodes[nb]["degree_value"] == 1) else 2
-                        if G.nodes[nb]["edge_value"] < required_degree:
-                            G.nodes[nb]["edge_value"] += 1
-                        if G.nodes[nb]["edge_value"] == required_degree and G.nodes[nb]["degree_value"] > required_degree:
+                        required_degree = 1 if (node_list == start or degree_value[node_list] == 1) else 2
+                        edge_value[node_list] = required_degree
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if edge_value[nb] < required_degree:
+                            edge_value[nb] += 1
+                        if edge_value[nb] == required_degree and degree_value[nb] > required_degree:
                             remove_list.append(nb)
 
+        if stats is not None:
+            stats.forced_moves += len(path) - depth_before
+
         if len(path) == total_nodes:
             solution_path = path
             finished = True
@@ -252,7 +409,7 @@ def edge_elimination_dfs(G, start):
             break
 
         neighbors = [nb for nb in G.neighbors(node) if nb not in visited_node]
-        neighbors.sort(key=lambda x: G.degree(x), reverse=True)
+        neighbors = order_candidates(G, neighbors, visited_node, ordering, tie)
 
         for nb in neighbors:
             if nb not in visited_node and tuple(sorted((node, nb))) not in removed_edge:
@@ -269,26 +426,28 @@ def edge_elimination_dfs(G, start):
 # Validation Algorithms
 
 def tarjan_validation(G, start, visited_node=None, removed_edge=None):
-    if visited_node:
-        for node in list(G.nodes()):
-            if node in visited_node and node != start:
-                G.remove_node(node)
-
-    if removed_edge:
-        for edge in removed_edge:
-            if edge and G.has_edge(edge[0], edge[1]):
-                G.remove_edge(edge[0], edge[1])
-
-    components = list(nx.connected_components(G))
-    if len(components) > 1:
+    # G is only read: visited cells and removed edges are skipped, not deleted
+    dead = {node for node in visited_node if node != start} if visited_node else set()
+    removed = {frozenset(edge) for edge in removed_edge if edge} if removed_edge else set()
+    nodes = [node for node in G.nodes() if node not in dead]
+    adjacency = {node: [nb for nb in G.neighbors(node) if nb not in dead and frozenset((node, nb)) not in removed] for node in nodes}
+
+    reached = {start}
+    queue = deque([start])
+    while queue:
+        for nb in adjacency[queue.popleft()]:
+            if nb not in reached:
+                reached.add(nb)
+                queue.append(nb)
+    if len(reached) < len(nodes):
         return False
 
-    mapping = {node: i for i, node in enumerate(G.nodes())}
+    mapping = {node: i for i, node in enumerate(nodes)}
     rev_map = {i: node for node, i in mapping.items()}
 
     start_idx = mapping[start]
 
-    n = len(G)
+    n = len(nodes)
     disc = [-1] * n
     low  = [-1] * n
     parent = [-1] * n
@@ -323,7 +482,7 @@ def tarjan_validation(G, start, visited_node=None, removed_edge=None):
 
     while dfs:
         u, p, idx = dfs.pop()
-        neighbors = list(G.neighbors(rev_map[u]))
+        neighbors = adjacency[rev_map[u]]
 
         if idx < len(neighbors):
             v = mapping[neighbors[idx]]
@@ -378,8 +537,33 @@ def tarjan_validation(G, start, visited_node=None, removed_edge=None):
 
 # Fifth Algorithm (backtracking + greedy + forced move + validation)
 
-def validation_forced_move_dfs(G, start):
+@collect_stats
+def validation_forced_move_dfs(G, start, engine="graph", memo=None, ordering="degree", tie_break=None, precheck=True, construct=True, split=False, restarts=None, budget=None, stats=None):
+    if precheck and precheck_board(G, start):
+        if stats is not None:
+            stats.shortcut = "precheck"
+        return [], False, None, "0.000000 s (0.000 ms)"
+    if construct:
+        result = constructive_solve(G, start)
+        if result:
+            if stats is not None:
+                stats.shortcut = "construct"
+            return result
+    if split:
+        return split_solve(G, start, validation_forced_move_dfs, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=precheck, construct=construct, restarts=restarts, budget=budget, stats=stats)
+    if restarts:
+        return restart_solve(G, start, validation_forced_move_dfs, restarts=restarts, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=False, construct=False, budget=budget, stats=stats)
+    if engine == "bitboard" and memo is None:
+        return bitboard_validation_forced_move_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "lowmem" and memo is None:
+        return lowmem_validation_forced_move_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "parallel" and memo is None:
+        return parallel_validation_forced_move_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "trail" or memo is not None:
+        return trail_validation_forced_move_dfs(G, start, memo=memo, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
     time_start = datetime.now()
+    tie = resolve_tie_break(tie_break, start, G.nodes())
     total_nodes = len(G.nodes())
 
     solution_path = []
@@ -389,6 +573,8 @@ def validation_forced_move_dfs(G, start):
     for node in G.nodes():
         if G.degree(node) == 1 and node != start:
             if solution_finish_node:
+                if stats is not None:
+                    stats.finish_prunes += 1
                 return solution_path, finished, solution_finish_node, "0.000000 s (0.000 ms)"
             solution_finish_node = node
 
@@ -400,18 +586,30 @@ def validation_forced_move_dfs(G, start):
         if n % 2 == 0:
             if not (u + v) % 2 != (nu + nv) % 2:
                 solution_finish_node = None
+                if stats is not None:
+                    stats.parity_prunes += 1
                 return solution_path, finished, solution_finish_node, "0.000000 s (0.000 ms)"
         else:
             if not (u + v) % 2 == (nu + nv) % 2:
                 solution_finish_node = None
+                if stats is not None:
+                    stats.parity_prunes += 1
                 return solution_path, finished, solution_finish_node, "0.000000 s (0.000 ms)"
 
+    validator = ArticulationValidator(G)
+
     stack = deque()
     stack.append((start, [start], {start}, solution_finish_node))   # (node sekarang, path, visited set)
 
     while stack:
         node, path, visited, finish_node = stack.pop()
 
+        if budget is not None and budget.spend(len(path)):
+            break
+        if stats is not None:
+            stats.peak_stack = max(stats.peak_stack, len(stack) + 1)
+            depth_before = len(path)
+
         valid_finish_node = True
 
         forced = True
@@ -441,6 +639,8 @@ def validation_forced_move_dfs(G, start):
                 forced = True
             elif len(forced_moves) > 1:
                 if finish_node:
+                    if stats is not None:
+                        stats.finish_prunes += 1
                     valid_finish_node = False
                     break
 
@@ -452,12 +652,16 @@ def validation_forced_move_dfs(G, start):
                     if (u + v) % 2 != (nu + nv) % 2:
                         finish_node = forced_moves[0]
                     else:
+                        if stats is not None:
+                            stats.parity_prunes += 1
                         valid_finish_node = False
                         break
                 else:
                     if (u + v) % 2 == (nu + nv) % 2:
                         finish_node = forced_moves[0]
                     else:
+                        if stats is not None:
+                            stats.parity_prunes += 1
                         valid_finish_node = False
                         break
 
@@ -466,10 +670,17 @@ def validation_forced_move_dfs(G, start):
                 visited.add(node)
                 forced = True
 
+        if stats is not None:
+            stats.forced_moves += len(path) - depth_before
+
         if not valid_finish_node:
             continue
 
-        if not tarjan_validation(G.copy(), node, visited_node=visited):
+        if stats is not None:
+            stats.validations += 1
+        if not validator.validate(node, visited_node=visited):
+            if stats is not None:
+                stats.validation_rejections += 1
             continue
 
         if len(path) == total_nodes:
@@ -479,7 +690,7 @@ def validation_forced_move_dfs(G, start):
             break
 
         neighbors = [nb for nb in G.neighbors(node) if nb not in visited]
-        neighbors.sort(key=lambda x: G.degree(x), reverse=True)
+        neighbors = order_candidates(G, neighbors, visited, ordering, tie)
 
         for nb in neighbors:
             if nb not in visited:
@@ -495,8 +706,33 @@ def validation_forced_move_dfs(G, start):
 
 # Sixth Algorithm (backtracking + greedy + edge elimination + validation)
 
-def validation_edge_elimination_dfs(G, start):
+@collect_stats
+def validation_edge_elimination_dfs(G, start, engine="graph", memo=None, ordering="degree", tie_break=None, precheck=True, construct=True, split=False, restarts=None, budget=None, stats=None):
+    if precheck and precheck_board(G, start):
+        if stats is not None:
+            stats.shortcut = "precheck"
+        return [], False, None, "0.000000 s (0.000 ms)"
+    if construct:
+        result = constructive_solve(G, start)
+        if result:
+            if stats is not None:
+                stats.shortcut = "construct"
+            return result
+    if split:
+        return split_solve(G, start, validation_edge_elimination_dfs, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=precheck, construct=construct, restarts=restarts, budget=budget, stats=stats)
+    if restarts:
+        return restart_solve(G, start, validation_edge_elimination_dfs, restarts=restarts, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=False, construct=False, budget=budget, stats=stats)
+    if engine == "bitboard" and memo is None:
+        return bitboard_validation_edge_elimination_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "lowmem" and memo is None:
+        return lowmem_validation_edge_elimination_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "parallel" and memo is None:
+        return parallel_validation_edge_elimination_dfs(G, start, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+    if engine == "trail" or memo is not None:
+        return trail_validation_edge_elimination_dfs(G, start, memo=memo, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
     time_start = datetime.now()
+    tie = resolve_tie_break(tie_break, start, G.nodes())
     total_nodes = len(G.nodes())
 
     solution_path = []
@@ -506,6 +742,8 @@ def validation_edge_elimination_dfs(G, start):
     for node in G.nodes():
         if G.degree(node) == 1 and node != start:
             if solution_finish_node:
+                if stats is not None:
+                    stats.finish_prunes += 1
                 return solution_path, finished, solution_finish_node, "0.000000 s (0.000 ms)"
             solution_finish_node = node
 
@@ -517,31 +755,37 @@ def validation_edge_elimination_dfs(G, start):
         if n % 2 == 0:
             if not (u + v) % 2 != (nu + nv) % 2:
                 solution_finish_node = None
+                if stats is not None:
+                    stats.parity_prunes += 1
                 return solution_path, finished, solution_finish_node, "0.000000 s (0.000 ms)"
         else:
             if not (u + v) % 2 == (nu + nv) % 2:
                 solution_finish_node = None
+                if stats is not None:
+                    stats.parity_prunes += 1
                 return solution_path, finished, solution_finish_node, "0.000000 s (0.000 ms)"
 
-    nx.set_node_attributes(G, {n: G.degree(n) for n in G.nodes()}, "degree_value")
-    nx.set_node_attributes(G, {n: 0 for n in G.nodes()}, "edge_value")
+    # Propagation state lives in this call, so G is never written to
+    degree_value = {n: G.degree(n) for n in G.nodes()}
+    edge_value = dict.fromkeys(G.nodes(), 0)
 
-    remove_list = []
-    append_list = []
+    root_removals = []   # queued by the setup, propagated with the root entry
 
     visited_edge = set()
     for node in list(G.nodes()):
-        required_degree = 1 if (node == start or G.nodes[node]["degree_value"] == 1) else 2
-        if G.nodes[node]["degree_value"] == required_degree:
-            G.nodes[node]["edge_value"] = required_degree
+        required_degree = 1 if (node == start or degree_value[node] == 1) else 2
+        if degree_value[node] == required_degree:
+            edge_value[node] = required_degree
             neighbors = list(G.neighbors(node))
             for nb in neighbors:
                 visited_edge.add(tuple(sorted((node, nb))))
                 required_degree = 1 if (nb == start or G.degree(nb) == 1) else 2
-                if G.nodes[nb]["edge_value"] < required_degree:
-                    G.nodes[nb]["edge_value"] += 1
-                if G.nodes[nb]["edge_value"] == required_degree and G.nodes[nb]["degree_value"] > required_degree:
-                    remove_list.append(nb)
+                if edge_value[nb] < required_degree:
+                    edge_value[nb] += 1
+                if edge_value[nb] == required_degree and degree_value[nb] > required_degree:
+                    root_removals.append(nb)
+
+    validator = ArticulationValidator(G)
 
     stack = deque()
     stack.append((start, [start], {start}, visited_edge, {None}, solution_finish_node))   # (node sekarang, path, visited node, visited edge, removed edge, finish node)
@@ -549,6 +793,16 @@ def validation_edge_elimination_dfs(G, start):
     while stack:
         node, path, visited_node, visited_edge, removed_edge, finish_node = stack.pop()
 
+        if budget is not None and budget.spend(len(path)):
+            break
+        if stats is not None:
+            stats.peak_stack = max(stats.peak_stack, len(stack) + 1)
+            depth_before = len(path)
+
+        # Each entry propagates with its own queues, so a rejected state leaves nothing behind
+        remove_list, append_list = root_removals, []
+        root_removals = []
+
         valid_finish_node = True
 
         step = True
@@ -572,16 +826,18 @@ def validation_edge_elimination_dfs(G, start):
                     if edge not in visited_edge:
                         removed_edge.add(edge)
 
-                        required_degree = 1 if (node_list == start or G.nodes[node_list]["degree_value"] == 1) else 2
-                        if G.nodes[node_list]["degree_value"] > required_degree:
-                            G.nodes[node_list]["degree_value"] -= 1
+                        required_degree = 1 if (node_list == start or degree_value[node_list] == 1) else 2
+                        if degree_value[node_list] > required_degree:
+                            degree_value[node_list] -= 1
 
-                        required_degree = 1 if (nb == start or G.nodes[nb]["degree_value"] == 1) else 2
-                        if G.nodes[nb]["degree_value"] > required_degree:
-                            G.nodes[nb]["degree_value"] -= 1
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if degree_value[nb] > required_degree:
+                            degree_value[nb] -= 1
 
-                        if G.nodes[nb]["degree_value"] == 1 and nb != start:
+                        if degree_value[nb] == 1 and nb != start:
                             if finish_node:
+                                if stats is not None:
+                                    stats.finish_prunes += 1
                                 valid_finish_node = False
                                 break
                                 
@@ -593,17 +849,21 @@ def validation_edge_elimination_dfs(G, start):
                                 if (u + v) % 2 != (nu + nv) % 2:
                                     finish_node = nb
                                 else:
+                                    if stats is not None:
+                                        stats.parity_prunes += 1
                                     valid_finish_node = False
                                     break
                             else:
                                 if (u + v) % 2 == (nu + nv) % 2:
                                     finish_node = nb
                                 else:
+                                    if stats is not None:
+                                        stats.parity_prunes += 1
                                     valid_finish_node = False
                                     break
 
-                        required_degree = 1 if (nb == start or G.nodes[nb]["degree_value"] == 1) else 2
-                        if G.nodes[nb]["degree_value"] == required_degree:
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if degree_value[nb] == required_degree:
                             append_list.append(nb)
 
             while append_list and valid_finish_node:
@@ -614,18 +874,25 @@ def validation_edge_elimination_dfs(G, start):
                     if edge not in removed_edge:
                         step = True
                         visited_edge.add(edge)
-                        required_degree = 1 if (node_list == start or G.nodes[node_list]["degree_value"] == 1) else 2
-                        G.nodes[node_list]["edge_value"] = required_degree
-                        required_degree = 1 if (nb == start or G.nodes[nb]["degree_value"] == 1) else 2
-                        if G.nodes[nb]["edge_value"] < required_degree:
-                            G.nodes[nb]["edge_value"] += 1
-                        if G.nodes[nb]["edge_value"] == required_degree and G.nodes[nb]["degree_value"] > required_degree:
+                        required_degree = 1 if (node_list == start or degree_value[node_list] == 1) else 2
+                        edge_value[node_list] = required_degree
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if edge_value[nb] < required_degree:
+                            edge_value[nb] += 1
+                        if edge_value[nb] == required_degree and degree_value[nb] > required_degree:
                             remove_list.append(nb)
 
+        if stats is not None:
+            stats.forced_moves += len(path) - depth_before
+
         if not valid_finish_node:
             continue
 
-        if not tarjan_validation(G.copy(), node, visited_node=visited_node, removed_edge=removed_edge):
+        if stats is not None:
+            stats.validations += 1
+        if not validator.validate(node, visited_node=visited_node, removed_edge=removed_edge):
+            if stats is not None:
+                stats.validation_rejections += 1
             continue
 
         if len(path) == total_nodes:
@@ -635,7 +902,7 @@ def validation_edge_elimination_dfs(G, start):
             break
 
         neighbors = [nb for nb in G.neighbors(node) if nb not in visited_node]
-        neighbors.sort(key=lambda x: G.degree(x), reverse=True)
+        neighbors = order_candidates(G, neighbors, visited_node, ordering, tie)
 
         for nb in neighbors:
             if nb not in visited_node and tuple(sorted((node, nb))) not in removed_edge:
@@ -647,3 +914,47 @@ def validation_edge_elimination_dfs(G, start):
     elapsed_s = time_finished.total_seconds()
 
     return solution_path, finished, solution_finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
+
+
+# Seventh Algorithm (any combination of propagators)
+
+@collect_stats
+def propagation_dfs(G, start, propagators=("edges", "dead_ends", "parity", "articulation"), engine="trail", memo=None, ordering="warnsdorff", tie_break=None,
+                    precheck=True, construct=True, split=False, restarts=None, budget=None, stats=None):
+    """DFS with the chosen propagators from propagate.py on the undo-trail state.
+
+    Any subset of "edges", "dead_ends", "parity" and "articulation" can be
+    combined, and ordering=None keeps the plain neighbour order. The search
+    always runs on the trail engine; engine is only passed on by split and
+    restart mode.
+    """
+    if precheck and precheck_board(G, start):
+        if stats is not None:
+            stats.shortcut = "precheck"
+        return [], False, None, "0.000000 s (0.000 ms)"
+    if construct:
+        result = constructive_solve(G, start)
+        if result:
+            if stats is not None:
+                stats.shortcut = "construct"
+            return result
+    if split:
+        return split_solve(G, start, propagation_dfs, propagators=propagators, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=precheck, construct=construct, restarts=restarts, budget=budget, stats=stats)
+    if restarts:
+        return restart_solve(G, start, propagation_dfs, restarts=restarts, propagators=propagators, engine=engine, memo=memo, ordering=ordering, tie_break=tie_break, precheck=False, construct=False, budget=budget, stats=stats)
+
+    return trail_propagation_dfs(G, start, propagators, memo=memo, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+# Enumerate / count all solutions (pruning of validation_edge_elimination_dfs)
+
+def enumerate_solutions(G, start, ordering="degree", tie_break=None, precheck=True, budget=None):
+    if precheck and precheck_board(G, start):
+        return
+    yield from trail_solutions(G, start, ordering=ordering, tie_break=tie_break, budget=budget)
+
+
+def count_solutions(G, start, precheck=True, budget=None):
+    if precheck and precheck_board(G, start):
+        return 0
+    return trail_count_solutions(G, start, budget=budget)
@@ -0,0 +1,417 @@
+from datetime import datetime
+from collections import deque
+
+# Deployment
+from src.ordering import resolve_tie_break
+# Local testing
+# from ordering import resolve_tie_break
+
+# Bitboard Representation
+
+class BitBoard:
+    """Grid graph packed into Python integers, one bit per cell.
+
+    Cell (r, c) lives at bit r * stride + c. The stride is one wider than the
+    board so the padding column absorbs left/right shifts that would otherwise
+    wrap onto the next row. Edges that are missing from the source graph are
+    kept as pre-cut edge bits (``base_hcut`` / ``base_vcut``).
+    """
+
+    def __init__(self, cells, edges):
+        self.rows = max(r for r, _ in cells) + 1
+        self.cols = max(c for _, c in cells) + 1
+        self.stride = self.cols + 1
+
+        S = self.stride
+        self.walk = 0
+        self.black = 0
+        for r, c in cells:
+            bit = 1 << (r * S + c)
+            self.walk |= bit
+            if (r + c) % 2 == 0:
+                self.black |= bit
+
+        # Horizontal edge u-(u+1) is stored at bit u, vertical edge u-(u+S) at bit u
+        hedge = self.walk & (self.walk >> 1)
+        vedge = self.walk & (self.walk >> S)
+        hpresent = vpresent = 0
+        for (r1, c1), (r2, c2) in edges:
+            u, v = sorted((r1 * S + c1, r2 * S + c2))
+            if v - u == 1:
+                hpresent |= 1 << u
+            elif v - u == S:
+                vpresent |= 1 << u
+        self.base_hcut = hedge & ~hpresent
+        self.base_vcut = vedge & ~vpresent
+
+        R, D = self.live_edges(self.walk, self.base_hcut, self.base_vcut)
+        self.neighbor_mask = {}
+        for r, c in cells:
+            i = r * S + c
+            self.neighbor_mask[i] = self.spread(1 << i, R, D)
+        self.degree = {i: m.bit_count() for i, m in self.neighbor_mask.items()}
+
+    @classmethod
+    def from_graph(cls, G):
+        return cls(list(G.nodes()), list(G.edges()))
+
+    def index(self, cell):
+        r, c = cell
+        return r * self.stride + c
+
+    def cell(self, i):
+        return divmod(i, self.stride)
+
+    def live_edges(self, alive, hcut, vcut):
+        """Masks of uncut edges whose both ends are alive (right-hand, lower-hand)"""
+        R = alive & (alive >> 1) & ~hcut
+        D = alive & (alive >> self.stride) & ~vcut
+        return R, D
+
+    def spread(self, mask, R, D):
+        """Cells one live edge away from any cell in mask"""
+        S = self.stride
+        return ((mask & R) << 1) | ((mask >> 1) & R) | ((mask & D) << S) | ((mask >> S) & D)
+
+    def degree_masks(self, alive, R, D):
+        """Split alive cells by live degree into (deg0, deg1, deg2) masks"""
+        S = self.stride
+        a, b, c, d = R, R << 1, D, D << S
+
+        s1, c1 = a ^ b, a & b
+        s2, c2 = c ^ d, c & d
+        bit0, c3 = s1 ^ s2, s1 & s2
+        bit1 = c1 ^ c2 ^ c3
+        bit2 = (c1 & c2) | (c3 & (c1 ^ c2))
+
+        deg0 = alive & ~(a | b | c | d)
+        deg1 = alive & bit0 & ~bit1 & ~bit2
+        deg2 = alive & bit1 & ~bit0 & ~bit2
+        return deg0, deg1, deg2
+
+    def connected(self, head, alive, R, D):
+        seen = frontier = 1 << head
+        while frontier:
+            frontier = self.spread(frontier, R, D) & ~seen
+            seen |= frontier
+        return seen == alive
+
+    def articulation_validation(self, head, alive, R, D):
+        """Same accept/reject rule as tarjan_validation, on the alive cells"""
+        if not self.connected(head, alive, R, D):
+            return False
+
+        S = self.stride
+
+        def neighbors(u):
+            out = []
+            if u >= S and (D >> (u - S)) & 1:
+                out.append(u - S)
+            if u >= 1 and (R >> (u - 1)) & 1:
+                out.append(u - 1)
+            if (R >> u) & 1:
+                out.append(u + 1)
+            if (D >> u) & 1:
+                out.append(u + S)
+            return out
+
+        disc = {head: 0}
+        low = {head: 0}
+        time = 1
+
+        stack_edges = []
+        articulation = set()
+        root_children = 0
+
+        def validate_bcc(bcc_edges):
+            nodes_inside = set()
+            for x, y in bcc_edges:
+                nodes_inside.add(x)
+                nodes_inside.add(y)
+            limit = 1 if head in nodes_inside else 2
+            return len(nodes_inside & articulation) <= limit
+
+        dfs = [(head, -1, neighbors(head), 0)]   # (node, parent, neighbors, next_neighbor_index)
+
+        while dfs:
+            u, p, nbs, idx = dfs.pop()
+
+            if idx < len(nbs):
+                v = nbs[idx]
+                dfs.append((u, p, nbs, idx + 1))
+
+                if v not in disc:  # tree edge
+                    if u == head:
+                        root_children += 1
+                    disc[v] = low[v] = time
+                    time += 1
+                    stack_edges.append((u, v))
+                    dfs.append((v, u, neighbors(v), 0))
+
+                elif v != p and disc[v] < disc[u]:  # back edge
+                    low[u] = min(low[u], disc[v])
+                    stack_edges.append((u, v))
+
+            elif p != -1:
+                low[p] = min(low[p], low[u])
+
+                if low[u] >= disc[p] and p != head:
+                    articulation.add(p)
+
+                    bcc_edges = []
+                    while stack_edges:
+                        a, b = stack_edges.pop()
+                        bcc_edges.append((a, b))
+                        if (a == p and b == u) or (a == u and b == p):
+                            break
+
+                    if not validate_bcc(bcc_edges):
+                        return False
+
+        if stack_edges and not validate_bcc(stack_edges):
+            return False
+
+        return root_children <= 1
+
+
+# Bitboard Search
+
+def _iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _unroll(link):
+    path = []
+    while link:
+        node, link = link
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def _propagate_edges(board, hbit, finish, alive, hcut, vcut, hfix, vfix):
+    """Fix edges of cells that must use all their live edges and cut the rest.
+
+    Only runs once the finish cell is known, so a cell with two live edges is
+    guaranteed to pass through rather than end there. Returns the updated
+    (hcut, vcut, hfix, vfix) or None when a cell is over-constrained.
+    """
+    S = board.stride
+    ends = finish | hbit
+
+    while True:
+        R, D = board.live_edges(alive, hcut, vcut)
+        deg0, deg1, deg2 = board.degree_masks(alive, R, D)
+        if deg0 & ~hbit & alive:
+            return None
+
+        need = (deg2 & ~ends) | (deg1 & ends)
+        hfix |= R & (need | (need >> 1))
+        vfix |= D & (need | (need >> S))
+
+        FR, FD = hfix & R, vfix & D
+        fix0, fix1, fix2 = board.degree_masks(alive, FR, FD)
+        fixed_any = FR | (FR << 1) | FD | (FD << S)
+        fix3 = alive & fixed_any & ~fix1 & ~fix2
+        if fix3 or (fix2 & ends):
+            return None
+
+        saturated = (fix2 & ~ends) | (fix1 & ends)
+        new_hcut = hcut | (R & ~hfix & (saturated | (saturated >> 1)))
+        new_vcut = vcut | (D & ~vfix & (saturated | (saturated >> S)))
+        if new_hcut == hcut and new_vcut == vcut:
+            return hcut, vcut, hfix, vfix
+        hcut, vcut = new_hcut, new_vcut
+
+
+def _bitboard_search(G, start, greedy=False, forced=False, edge_elimination=False, validation=False,
+                     ordering="degree", tie_break=None, budget=None, stats=None):
+    time_start = datetime.now()
+    board = BitBoard.from_graph(G)
+    tie = resolve_tie_break(tie_break, start, list(G.nodes()))
+    if ordering not in ("degree", "warnsdorff"):
+        raise ValueError(f"Unknown ordering: {ordering}")
+
+    solution_path = []
+    finished = False
+    finish_node = None
+
+    walk = board.walk
+    black = board.black
+    start_idx = board.index(start)
+
+    stack = deque()
+    stack.append((start_idx, (start_idx, None), 1 << start_idx, board.base_hcut, board.base_vcut, 0, 0))   # (head, path link, visited, hcut, vcut, hfix, vfix)
+
+    while stack:
+        head, link, visited, hcut, vcut, hfix, vfix = stack.pop()
+
+        if budget is not None and budget.spend(visited.bit_count()):
+            break
+        if stats is not None:
+            stats.peak_stack = max(stats.peak_stack, len(stack) + 1)
+
+        valid = True
+        while True:
+            hbit = 1 << head
+            free = walk & ~visited
+            if not free:
+                break
+
+            alive = free | hbit
+            R, D = board.live_edges(alive, hcut, vcut)
+            cand = board.spread(hbit, R, D)
+            if not cand:
+                valid = False
+                break
+
+            move = 0
+            if forced or edge_elimination:
+                deg0, deg1, deg2 = board.degree_masks(alive, R, D)
+                ends = deg1 & free
+                if deg0 & free:
+                    valid = False
+                    break
+                if (ends & (ends - 1)) or ((ends & cand) and (free & (free - 1))):
+                    if stats is not None:
+                        stats.finish_prunes += 1
+                    valid = False
+                    break
+
+                if ends and edge_elimination:
+                    fixes = _propagate_edges(board, hbit, ends, alive, hcut, vcut, hfix, vfix)
+                    if fixes is None:
+                        valid = False
+                        break
+                    hcut, vcut, hfix, vfix = fixes
+                    R, D = board.live_edges(alive, hcut, vcut)
+                    cand = board.spread(hbit, R, D)
+                    deg0, deg1, deg2 = board.degree_masks(alive, R, D)
+                    if not cand or ((deg1 & free) != ends):
+                        valid = False
+                        break
+                    move = board.spread(hbit, hfix & R, vfix & D)
+
+                # Neighbours with one other live edge become dead ends unless visited now
+                pass_through = deg2 & cand & ~ends
+                if move:
+                    pass
+                elif ends:
+                    if pass_through & (pass_through - 1):
+                        if stats is not None:
+                            stats.finish_prunes += 1
+                        valid = False
+                        break
+                    move = pass_through
+                elif pass_through:
+                    rest = pass_through & (pass_through - 1)
+                    if rest & (rest - 1):
+                        if stats is not None:
+                            stats.finish_prunes += 1
+                        valid = False
+                        break
+                    if rest:
+                        cand = pass_through
+
+            if not move and not (cand & (cand - 1)):
+                move = cand
+            if not move:
+                break
+
+            head = move.bit_length() - 1
+            visited |= move
+            link = (head, link)
+            if stats is not None:
+                stats.forced_moves += 1
+
+        if not valid:
+            continue
+
+        free = walk & ~visited
+        if validation and free:
+            hbit = 1 << head
+            alive = free | hbit
+            total = alive.bit_count()
+            same = (alive & black).bit_count() if hbit & black else (alive & ~black).bit_count()
+            if same != (total + 1) // 2:
+                if stats is not None:
+                    stats.parity_prunes += 1
+                continue
+
+            R, D = board.live_edges(alive, hcut, vcut)
+            _, deg1, _ = board.degree_masks(alive, R, D)
+            ends = deg1 & free
+            if ends and bool(ends & black) != (bool(hbit & black) == (total % 2 == 1)):
+                if stats is not None:
+                    stats.parity_prunes += 1
+                continue
+
+            valid = board.articulation_validation(head, alive, R, D)
+            if stats is not None:
+                stats.validations += 1
+                if not valid:
+                    stats.validation_rejections += 1
+            if not valid:
+                continue
+
+        if not free:
+            solution_path = [board.cell(i) for i in _unroll(link)]
+            finished = True
+            finish_node = solution_path[-1]
+            break
+
+        R, D = board.live_edges(free | (1 << head), hcut, vcut)
+        neighbors = list(_iter_bits(board.spread(1 << head, R, D)))
+        if greedy:
+            if ordering == "warnsdorff":
+                def primary(x):
+                    return (board.spread(1 << x, R, D) & free).bit_count()
+            else:
+                primary = board.degree.__getitem__
+
+            if tie is None:
+                neighbors.sort(key=primary, reverse=True)
+            else:
+                neighbors.sort(key=lambda x: (primary(x), tie(board.cell(x))), reverse=True)
+
+        for nb in neighbors:
+            stack.append((nb, (nb, link), visited | (1 << nb), hcut, vcut, hfix, vfix))
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+
+    return solution_path, finished, finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
+
+
+# Bitboard variants of the six algorithms in algo.py
+
+def bitboard_backtracking_dfs(G, start, budget=None, stats=None):
+    return _bitboard_search(G, start, budget=budget, stats=stats)
+
+
+def bitboard_greedy_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _bitboard_search(G, start, greedy=True,
+                            ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def bitboard_forced_move_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _bitboard_search(G, start, greedy=True, forced=True,
+                            ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def bitboard_edge_elimination_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _bitboard_search(G, start, greedy=True, edge_elimination=True,
+                            ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def bitboard_validation_forced_move_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _bitboard_search(G, start, greedy=True, forced=True, validation=True,
+                            ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def bitboard_validation_edge_elimination_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _bitboard_search(G, start, greedy=True, edge_elimination=True, validation=True,
+                            ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
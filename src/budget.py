@@ -0,0 +1,76 @@
+import time
+
+# Search Budget
+
+class Budget:
+    """Wall-clock, node and cancellation limits for one solve.
+
+    Solvers call spend() once per expanded state and stop as soon as it
+    returns True. The budget is also the out-param for the outcome: after the
+    solve, gave_up tells a search that stopped early ("deadline", "nodes" or
+    "cancelled" in reason) apart from one that proved there is no path, and
+    stats() holds the partial statistics either way.
+
+    cancel may be anything with is_set() (threading or multiprocessing Event)
+    or a callable returning True to stop.
+    """
+
+    CHECK_EVERY = 256   # expansions between deadline / cancel polls
+
+    def __init__(self, time_limit=None, max_nodes=None, cancel=None):
+        self.started = time.monotonic()
+        self.deadline = self.started + time_limit if time_limit is not None else None
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+
+        self.nodes = 0
+        self.max_depth = 0
+        self.gave_up = False
+        self.reason = None
+
+    def spend(self, depth=0, count=1):
+        """Count expansions, the deepest at path length depth; True means stop searching"""
+        if self.gave_up:
+            return True
+        before = self.nodes
+        self.nodes += count
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            return self.give_up("nodes")
+        if self.nodes // self.CHECK_EVERY != before // self.CHECK_EVERY:
+            return self.check()
+        return False
+
+    def check(self):
+        """Poll the deadline and the cancel token"""
+        if self.gave_up:
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return self.give_up("deadline")
+        if self.cancel is not None:
+            cancelled = self.cancel.is_set() if hasattr(self.cancel, "is_set") else self.cancel()
+            if cancelled:
+                return self.give_up("cancelled")
+        return False
+
+    def give_up(self, reason):
+        if not self.gave_up:
+            self.gave_up = True
+            self.reason = reason
+        return True
+
+    def remaining(self):
+        """Seconds left before the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def stats(self):
+        return {
+            "gave_up": self.gave_up,
+            "reason": self.reason,
+            "nodes": self.nodes,
+            "max_depth": self.max_depth,
+            "elapsed_s": time.monotonic() - self.started,
+        }
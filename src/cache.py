@@ -0,0 +1,143 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from contextlib import closing
+
+# Canonical Board Form
+
+def canonical_board(matrix):
+    """Key shared by all 8 rotations / reflections of a board, plus the cell map.
+
+    The wall margin is cropped first. Of the 8 transformed matrices the one
+    with the smallest (shape, bytes) is canonical. cells[i][j] is the
+    original (row, col) of canonical cell (i, j).
+    """
+    arr = np.asarray(matrix, dtype=np.int8)
+    rows, cols = np.nonzero(arr)
+    top = left = 0
+    if rows.size:
+        top, left = int(rows.min()), int(cols.min())
+        arr = arr[top:rows.max() + 1, left:cols.max() + 1]
+    index = np.arange(arr.size).reshape(arr.shape)   # transformed alongside arr to map cells back
+
+    best = None
+    for k in range(8):
+        a, i = (arr, index) if k < 4 else (arr.T, index.T)
+        a, i = np.rot90(a, k % 4), np.rot90(i, k % 4)
+        form = (a.shape, a.tobytes())
+        if best is None or form < best[0]:
+            best = (form, i)
+
+    (shape, data), index = best
+    key = hashlib.sha256(repr(shape).encode() + data).hexdigest()
+    width = arr.shape[1]
+    cells = [[(top + v // width, left + v % width) for v in row] for row in index.tolist()]
+    return key, cells
+
+
+# Solution Cache
+
+class SolutionCache:
+    """Solved paths by canonical board, in an LRU dict backed by SQLite.
+
+    Paths are stored in canonical coordinates, so a rotated or mirrored copy
+    of a solved level is a hit and gets the path mapped onto its own cells.
+    The disk tier keeps at most max_disk boards, dropping the least recently
+    used. If the database cannot be opened (read-only filesystem) the cache
+    carries on in memory only; a statement that fails later (database locked
+    by another worker) is skipped and the disk tier stays on.
+    """
+
+    def __init__(self, path=None, max_memory=256, max_disk=10_000):
+        if max_memory < 1:
+            raise ValueError("SolutionCache needs room for at least one entry in memory")
+
+        self.path = path
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path is not None and self._execute("CREATE TABLE IF NOT EXISTS solutions "
+                                              "(key TEXT PRIMARY KEY, path TEXT NOT NULL, used REAL NOT NULL)") is None:
+            self.path = None
+
+    def _execute(self, sql, args=()):
+        try:
+            with closing(sqlite3.connect(self.path, timeout=5)) as db, db:
+                return db.execute(sql, args).fetchall()
+        except sqlite3.Error:
+            return None
+
+    def _disk(self, sql, args=()):
+        """Run one statement on the disk tier; None if it is off or the statement failed"""
+        if self.path is None:
+            return None
+        return self._execute(sql, args)
+
+    def _remember(self, key, canonical_path):
+        with self.lock:
+            self.entries[key] = canonical_path
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_memory:
+                self.entries.popitem(last=False)
+
+    def get(self, matrix):
+        """Cached path for this board in its own coordinates, or None"""
+        key, cells = canonical_board(matrix)
+        with self.lock:
+            canonical_path = self.entries.get(key)
+            if canonical_path is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+
+        if canonical_path is None:
+            rows = self._disk("SELECT path FROM solutions WHERE key = ?", (key,))
+            if not rows:
+                with self.lock:
+                    self.misses += 1
+                return None
+            canonical_path = [tuple(cell) for cell in json.loads(rows[0][0])]
+            self._disk("UPDATE solutions SET used = ? WHERE key = ?", (time.time(), key))
+            self._remember(key, canonical_path)
+            with self.lock:
+                self.disk_hits += 1
+
+        return [cells[i][j] for i, j in canonical_path]
+
+    def put(self, matrix, path):
+        """Store a solved path given in the matrix's own coordinates"""
+        key, cells = canonical_board(matrix)
+        position = {cell: (i, j) for i, row in enumerate(cells) for j, cell in enumerate(row)}
+        canonical_path = [position[tuple(cell)] for cell in path]
+        self._remember(key, canonical_path)
+
+        self._disk("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)", (key, json.dumps(canonical_path), time.time()))
+        self._disk("DELETE FROM solutions WHERE key IN (SELECT key FROM solutions ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.max_disk,))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+        self._disk("DELETE FROM solutions")
+
+    def stats(self):
+        rows = self._disk("SELECT COUNT(*) FROM solutions")
+        with self.lock:
+            memory_entries, hits, disk_hits, misses = len(self.entries), self.hits, self.disk_hits, self.misses
+        lookups = hits + disk_hits + misses
+        return {
+            "memory_entries": memory_entries,
+            "disk_entries": rows[0][0] if rows else None,
+            "hits": hits,
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "hit_rate": (hits + disk_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,155 @@
+# Articulation Validation without graph copies
+
+class ArticulationValidator:
+    """Reusable tarjan_validation over preallocated arrays.
+
+    Built once per solve from the full graph. Cell ids follow G.nodes() order
+    and edge ids follow G.edges() order. Each check runs one iterative Tarjan
+    pass from the head over the cells that are still alive, skipping dead
+    cells and cut edges in place, and accepts or rejects exactly like
+    tarjan_validation(G, ...). Per-check arrays are reset lazily with an
+    epoch stamp, so a check allocates nothing but its DFS and edge stacks.
+    """
+
+    def __init__(self, G):
+        self.cells = list(G.nodes())
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        n = len(self.cells)
+
+        self.adj = [[] for _ in range(n)]   # (neighbor, edge id)
+        self.edge_index = {}
+        for e, (u, v) in enumerate(G.edges()):
+            iu, iv = self.index[u], self.index[v]
+            self.adj[iu].append((iv, e))
+            self.adj[iv].append((iu, e))
+            self.edge_index[(u, v)] = e
+            self.edge_index[(v, u)] = e
+
+        self.dead = bytearray(n)
+        self.cut = bytearray(len(self.edge_index) // 2)
+
+        self.disc = [0] * n
+        self.low = [0] * n
+        self.seen = [0] * n        # epoch in which disc/low are valid
+        self.articulation = [0] * n
+        self.block = [0] * n       # last block id the cell was counted in
+        self.epoch = 0
+        self.block_id = 0
+
+    def validate(self, start, visited_node=None, removed_edge=None):
+        """Drop-in for tarjan_validation(G, start, visited_node, removed_edge)"""
+        index = self.index
+        marked = []
+        if visited_node:
+            for cell in visited_node:
+                if cell != start:
+                    i = index[cell]
+                    self.dead[i] = 1
+                    marked.append(i)
+
+        cut_edges = []
+        if removed_edge:
+            for edge in removed_edge:
+                if edge:
+                    e = self.edge_index.get(edge)
+                    if e is not None and not self.cut[e]:
+                        self.cut[e] = 1
+                        cut_edges.append(e)
+
+        try:
+            return self.check(index[start], self.dead, self.cut, len(self.cells) - len(marked))
+        finally:
+            for i in marked:
+                self.dead[i] = 0
+            for e in cut_edges:
+                self.cut[e] = 0
+
+    def check(self, head, dead, cut, alive_total):
+        """Validate the alive region around head.
+
+        dead[i] marks removed cells (head is always treated as alive), cut[e]
+        marks removed edges, alive_total is the number of alive cells.
+        """
+        self.epoch += 1
+        epoch = self.epoch
+        adj, disc, low, seen = self.adj, self.disc, self.low, self.seen
+        articulation, block = self.articulation, self.block
+
+        disc[head] = low[head] = 0
+        seen[head] = epoch
+        time = 1
+        reached = 1
+        root_children = 0
+
+        stack_edges = []
+
+        def validate_bcc(bcc_edges):
+            self.block_id += 1
+            bid = self.block_id
+            aps = 0
+            contains_head = False
+            for x, y in bcc_edges:
+                for z in (x, y):
+                    if block[z] != bid:
+                        block[z] = bid
+                        if z == head:
+                            contains_head = True
+                        elif articulation[z] == epoch:
+                            aps += 1
+            return aps <= (1 if contains_head else 2)
+
+        dfs = [(head, -1, 0)]   # (node, parent, next_neighbor_index)
+
+        while dfs:
+            u, p, idx = dfs.pop()
+            nbs = adj[u]
+
+            while idx < len(nbs):
+                v, e = nbs[idx]
+                if (dead[v] and v != head) or cut[e]:
+                    idx += 1
+                    continue
+                break
+
+            if idx < len(nbs):
+                dfs.append((u, p, idx + 1))
+
+                if seen[v] != epoch:  # tree edge
+                    if u == head:
+                        root_children += 1
+                    seen[v] = epoch
+                    disc[v] = low[v] = time
+                    time += 1
+                    reached += 1
+                    stack_edges.append((u, v))
+                    dfs.append((v, u, 0))
+
+                elif v != p and disc[v] < disc[u]:  # back edge
+                    if disc[v] < low[u]:
+                        low[u] = disc[v]
+                    stack_edges.append((u, v))
+
+            elif p != -1:
+                if low[u] < low[p]:
+                    low[p] = low[u]
+
+                if low[u] >= disc[p] and p != head:
+                    articulation[p] = epoch
+
+                    bcc_edges = []
+                    while stack_edges:
+                        a, b = stack_edges.pop()
+                        bcc_edges.append((a, b))
+                        if (a == p and b == u) or (a == u and b == p):
+                            break
+
+                    if not validate_bcc(bcc_edges):
+                        return False
+
+        if reached < alive_total:
+            return False
+
+        if stack_edges and not validate_bcc(stack_edges):
+            return False
+
+        return root_children <= 1
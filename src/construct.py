@@ -0,0 +1,161 @@
+from datetime import datetime
+
+# Constructive Paths for Full Rectangles
+#
+# A hole-free R x C board needs no search. Even-area boards with both sides
+# at least 2 have a Hamiltonian cycle, so a path from any start follows that
+# cycle around. On odd x odd boards the start must have the corner colour,
+# and the path covers a band of rows around the start, then drops into the
+# rest of the board (even height) and follows its cycle. The odd x odd band
+# templates assume a particular corner, so every one of the 8 symmetries of
+# the board is tried, and each candidate is checked before it is returned.
+
+
+def comb_cycle(rows, cols, top=0):
+    """Hamiltonian cycle of rows x cols (rows even, both >= 2), offset by top rows"""
+    cycle = [(top, c) for c in range(cols)]
+    for i, r in enumerate(range(top + 1, top + rows)):
+        span = range(cols - 1, 0, -1) if i % 2 == 0 else range(1, cols)
+        cycle.extend((r, c) for c in span)
+    cycle.extend((r, 0) for r in range(top + rows - 1, top, -1))
+    return cycle
+
+
+def follow_cycle(cycle, entry):
+    i = cycle.index(entry)
+    return cycle[i:] + cycle[:i]
+
+
+def _even_row_band(rows, cols, r, c):
+    """s = (r, c) with r, c even and c < cols - 1 unless r is the last row"""
+    path = [(r, x) for x in range(c, -1, -1)]                  # left along row r
+    for x in range(c):                                         # rows 0..r-1 of columns 0..c-1, column snake
+        span = range(r - 1, -1, -1) if x % 2 == 0 else range(r)
+        path.extend((y, x) for y in span)
+    path.extend((y, c) for y in range(r - 1, -1, -1))          # up column c
+    for y in range(r + 1):                                     # rows 0..r of columns c+1.., row snake
+        span = range(c + 1, cols) if y % 2 == 0 else range(cols - 1, c, -1)
+        path.extend((y, x) for x in span)
+    return path
+
+
+def _odd_row_band(rows, cols, r, c):
+    """s = (r, c) with r, c odd; covers rows 0..r+1"""
+    h = r + 2
+    path = [(y, c) for y in range(r, -1, -1)]                  # up column c
+    path.extend((0, x) for x in range(c - 1, -1, -1))          # left along row 0
+    for x in range(c):                                         # rows 1..h-1 of columns 0..c-1, column snake
+        span = range(1, h) if x % 2 == 0 else range(h - 1, 0, -1)
+        path.extend((y, x) for y in span)
+    path.append((h - 1, c))
+    if c + 1 < cols:
+        path.extend((y, c + 1) for y in range(h - 1, -1, -1))  # up column c+1
+        for y in range(h):                                     # columns c+2.., row snake
+            span = range(c + 2, cols) if y % 2 == 0 else range(cols - 1, c + 1, -1)
+            path.extend((y, x) for x in span)
+    return path
+
+
+def _odd_board(rows, cols, r, c):
+    if r % 2 == 0:
+        band = _even_row_band(rows, cols, r, c)
+        top = r + 1
+    else:
+        band = _odd_row_band(rows, cols, r, c)
+        top = r + 2
+    if top == rows:
+        return band
+    last = band[-1]
+    if last[0] != top - 1:
+        return None
+    return band + follow_cycle(comb_cycle(rows - top, cols, top), (top, last[1]))
+
+
+SYMMETRIES = (
+    lambda R, C, r, c: (r, c),
+    lambda R, C, r, c: (r, C - 1 - c),
+    lambda R, C, r, c: (R - 1 - r, c),
+    lambda R, C, r, c: (R - 1 - r, C - 1 - c),
+    lambda R, C, r, c: (c, r),
+    lambda R, C, r, c: (c, R - 1 - r),
+    lambda R, C, r, c: (C - 1 - c, r),
+    lambda R, C, r, c: (C - 1 - c, R - 1 - r),
+)
+
+
+def _adjacent_walk(path, rows, cols, start):
+    if len(path) != rows * cols or path[0] != start or len(set(path)) != len(path):
+        return False
+    for (a, b), (x, y) in zip(path, path[1:]):
+        if abs(a - x) + abs(b - y) != 1 or not (0 <= x < rows and 0 <= y < cols):
+            return False
+    return True
+
+
+def rectangle_path(rows, cols, start):
+    """Hamiltonian path of a full rows x cols board from start, or None"""
+    r, c = start
+    if rows == 1 or cols == 1:
+        line = [(y, x) for y in range(rows) for x in range(cols)]
+        if start == line[0]:
+            return line
+        if start == line[-1]:
+            return line[::-1]
+        return None
+
+    if rows * cols % 2 == 0:
+        cycle = comb_cycle(rows, cols) if rows % 2 == 0 else [(y, x) for x, y in comb_cycle(cols, rows)]
+        return follow_cycle(cycle, start)
+
+    if (r + c) % 2:
+        return None   # odd board, start not on the corner colour
+
+    for i, transform in enumerate(SYMMETRIES):
+        R, C = (cols, rows) if i >= 4 else (rows, cols)
+        tr, tc = transform(rows, cols, r, c)
+        path = _odd_board(R, C, tr, tc)
+        if path is None:
+            continue
+        # Map back: transform i is its own inverse except the two quarter turns
+        inverse = SYMMETRIES[{5: 6, 6: 5}.get(i, i)]
+        path = [inverse(R, C, y, x) for y, x in path]
+        if _adjacent_walk(path, rows, cols, start):
+            return path
+    return None
+
+
+def construct_path(G, start):
+    """Path for a board whose cells fill their bounding box, or None"""
+    cells = list(G.nodes())
+    if not cells or start not in G:
+        return None
+    top = min(r for r, _ in cells)
+    left = min(c for _, c in cells)
+    rows = max(r for r, _ in cells) - top + 1
+    cols = max(c for _, c in cells) - left + 1
+    if rows * cols != len(cells):
+        return None
+
+    path = rectangle_path(rows, cols, (start[0] - top, start[1] - left))
+    if path is None:
+        return None
+    path = [(r + top, c + left) for r, c in path]
+
+    # Boards may have cut edges between adjacent cells, so check against G
+    for a, b in zip(path, path[1:]):
+        if not G.has_edge(a, b):
+            return None
+    return path
+
+
+def constructive_solve(G, start):
+    """Solver-style result for a constructible board, or None to search instead"""
+    time_start = datetime.now()
+    path = construct_path(G, start)
+    if path is None:
+        return None
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+
+    return path, True, path[-1], f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
@@ -0,0 +1,113 @@
+from datetime import datetime
+
+# Divide and Conquer over Articulation Points
+#
+# A Hamiltonian path can only cross a cut cell once, so on a solvable board
+# the block-cut tree is a chain starting at the block that holds the start.
+# Each block is solved on its own from its entry cell to the cut cell that
+# leads into the next block, and the partial paths are joined at the cut
+# cells. Search cost then follows the largest block instead of the board.
+
+
+def block_chain(G, start):
+    """Order the biconnected blocks along the block-cut tree.
+
+    Returns a list of (cells, entry, exit) with exit None for the last block,
+    or None when the blocks do not form a chain away from the start, in which
+    case the board has no Hamiltonian path from start.
+    """
+    import networkx as nx   # split mode only, keeps networkx off the default path
+
+    if not isinstance(G, nx.Graph):
+        G = G.to_networkx()
+
+    cells = set(G.nodes())
+    blocks = [set(b) for b in nx.biconnected_components(G)]
+
+    # Isolated cells belong to no block: a lone start is its own block, any other leaves a cell unreachable
+    if not any(start in block for block in blocks):
+        return [({start}, start, None)] if cells == {start} else None
+
+    articulation = set(nx.articulation_points(G))
+    if start in articulation:
+        return None
+
+    owners = {}   # cut cell -> indices of the blocks that contain it
+    for i, block in enumerate(blocks):
+        for cell in block & articulation:
+            owners.setdefault(cell, []).append(i)
+
+    current = next(i for i, block in enumerate(blocks) if start in block)
+    entry = start
+    chain = []
+
+    while True:
+        exits = [cell for cell in blocks[current] & articulation if cell != entry]
+        if len(exits) > 1:
+            return None
+        if not exits:
+            chain.append((blocks[current], entry, None))
+            break
+
+        exit_cell = exits[0]
+        chain.append((blocks[current], entry, exit_cell))
+
+        following = [i for i in owners[exit_cell] if i != current]
+        if len(following) != 1:
+            return None
+        current = following[0]
+        entry = exit_cell
+
+    # The chain must cover the board; isolated cells and other components are in no chained block
+    if len(chain) != len(blocks) or set().union(*(block for block, _, _ in chain)) != cells:
+        return None
+    return chain
+
+
+def split_solve(G, start, solver, **options):
+    """Run `solver` block by block along the block-cut tree and stitch the paths.
+
+    To force a block's path to end on its exit cut cell, the exit gets one
+    neighbour from the next block as a pendant cell. The pendant has degree 1,
+    so every Hamiltonian path of the block plus pendant ends there with the
+    exit just before it, and the pendant is a real grid cell so colour and
+    parity rules still hold. `options` are passed through to the solver.
+    """
+    time_start = datetime.now()
+
+    chain = block_chain(G, start)
+    if chain is None:
+        return [], False, None, "0.000000 s (0.000 ms)"
+
+    if len(chain) == 1:
+        return solver(G, start, **options)
+
+    memo = options.get("memo")
+    solution_path = [start]
+    finished = True
+
+    for cells, entry, exit_cell in chain:
+        # The pendant's only neighbour in cells is the exit (anything else would
+        # merge the two blocks), so the induced subgraph already has its edge
+        pendant = None
+        if exit_cell is not None:
+            pendant = next(nb for nb in G.neighbors(exit_cell) if nb not in cells)
+        H = G.subgraph(cells | {pendant} if pendant is not None else cells).copy()
+
+        if memo is not None:
+            memo.clear()   # dead states are only valid for the board they came from
+
+        path, finished, _, _ = solver(H, entry, **options)
+        if not finished:
+            solution_path = []
+            break
+
+        if pendant is not None:
+            path = path[:-1]
+        solution_path.extend(path[1:])
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+    finish_node = solution_path[-1] if finished else None
+
+    return solution_path, finished, finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
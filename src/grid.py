@@ -0,0 +1,208 @@
+import numpy as np
+
+# Compact Grid Graph
+#
+# Cells are numbered 0..n-1 in row-major order, and the neighbours of cell i
+# are targets[offsets[i]:offsets[i+1]] (int32 CSR arrays), listed up, left,
+# down, right. That is the order networkx gives for a graph built by
+# get_graph_from_binary_matrix, so solvers explore both graph types the same
+# way. The arrays are built with whole-matrix NumPy operations. The cell
+# tuples behind nodes() are materialised on first use, and edges() is read
+# straight from the arrays. Per-cell neighbour lists are only built when
+# neighbors() or degree() is called (graph and low-memory engines); the trail
+# and bitboard engines index the arrays themselves and never need them.
+
+DIRECTIONS = ((-1, 0), (0, -1), (1, 0), (0, 1))   # up, left, down, right
+
+
+class _NodeView:
+    """G.nodes() / G.nodes[n] in the networkx style"""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __call__(self):
+        return self
+
+    def __iter__(self):
+        return iter(self.graph.cells)
+
+    def __len__(self):
+        return len(self.graph)
+
+    def __contains__(self, cell):
+        return cell in self.graph
+
+    def __getitem__(self, cell):
+        if cell not in self.graph:
+            raise KeyError(cell)
+        return self.graph.attrs.setdefault(cell, {})
+
+
+class GridGraph:
+    """Grid-cell graph stored as int32 CSR arrays instead of networkx dicts"""
+
+    def __init__(self, walk, removed_edges=()):
+        self.walk = np.ascontiguousarray(walk, dtype=bool)
+        self.removed_edges = set(removed_edges)   # frozenset({u, v}) of cut grid edges
+        self.attrs = {}
+        self._build()
+
+    @classmethod
+    def from_matrix(cls, mat):
+        """Build from a board matrix (0 wall, 1 cell, 2 start); returns (graph, start)"""
+        arr = np.asarray(mat)
+        G = cls((arr == 1) | (arr == 2))
+        starts = np.argwhere(arr == 2)
+        start = tuple(int(x) for x in starts[-1]) if len(starts) else None
+        return G, start
+
+    def _build(self):
+        walk = self.walk
+        rows, cols = walk.shape
+        self.n = int(walk.sum())
+
+        ids = np.full((rows + 2, cols + 2), -1, dtype=np.int32)   # padded so shifts need no bounds checks
+        ids[1:-1, 1:-1][walk] = np.arange(self.n, dtype=np.int32)
+        self.ids = ids[1:-1, 1:-1]
+        self.coords = np.argwhere(walk).astype(np.int32)
+
+        r, c = self.coords[:, 0] + 1, self.coords[:, 1] + 1
+        nbrs = np.stack([ids[r + dr, c + dc] for dr, dc in DIRECTIONS], axis=1)
+
+        for edge in self.removed_edges:
+            (ur, uc), (vr, vc) = edge
+            u, v = self.ids[ur, uc], self.ids[vr, vc]
+            nbrs[u][nbrs[u] == v] = -1
+            nbrs[v][nbrs[v] == u] = -1
+
+        present = nbrs >= 0
+        self.degrees = present.sum(axis=1).astype(np.int32)
+        self.offsets = np.zeros(self.n + 1, dtype=np.int32)
+        np.cumsum(self.degrees, out=self.offsets[1:])
+        self.targets = nbrs[present].astype(np.int32)
+
+        self._cells = None
+        self._nbrs = None
+        self._stale = False
+
+    def refresh(self):
+        """Rebuild the arrays after remove_node / remove_edge"""
+        if self._stale:
+            self._build()
+
+    def _materialise(self):
+        self.refresh()
+        cells = [tuple(rc) for rc in self.coords.tolist()]
+        self._id_of = {cell: i for i, cell in enumerate(cells)}
+        self._cells = cells   # set last: other threads take a non-None _cells as ready
+
+    def _neighbor_lists(self):
+        nbrs = self._nbrs
+        if nbrs is None:
+            cells = self.cells
+            flat = [cells[t] for t in self.targets.tolist()]
+            offsets = self.offsets.tolist()
+            nbrs = self._nbrs = [flat[offsets[i]:offsets[i + 1]] for i in range(self.n)]
+        return nbrs
+
+    @property
+    def cells(self):
+        if self._cells is None:
+            self._materialise()
+        return self._cells
+
+    @property
+    def id_of(self):
+        if self._cells is None:
+            self._materialise()
+        return self._id_of
+
+    @property
+    def nbytes(self):
+        """Bytes held by the CSR arrays"""
+        self.refresh()
+        return sum(a.nbytes for a in (self.walk, self.ids, self.coords, self.degrees, self.offsets, self.targets))
+
+    # networkx-style API used by the solvers
+
+    @property
+    def nodes(self):
+        return _NodeView(self)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self):
+        self.refresh()
+        return self.n
+
+    def __contains__(self, cell):
+        return self._walkable(cell)
+
+    def number_of_nodes(self):
+        return len(self)
+
+    def neighbors(self, cell):
+        i = self.id_of[cell]
+        return iter(self._neighbor_lists()[i])
+
+    def degree(self, cell):
+        i = self.id_of[cell]
+        return len(self._neighbor_lists()[i])
+
+    def edges(self):
+        """Each edge once as (u, v), u before v in cell order, neighbours in CSR order"""
+        cells = self.cells
+        sources = np.repeat(np.arange(self.n, dtype=np.int32), self.degrees)
+        keep = self.targets > sources
+        return [(cells[i], cells[j]) for i, j in zip(sources[keep].tolist(), self.targets[keep].tolist())]
+
+    def _walkable(self, cell):
+        r, c = cell
+        rows, cols = self.walk.shape
+        return 0 <= r < rows and 0 <= c < cols and bool(self.walk[r, c])
+
+    def has_edge(self, u, v):
+        # Straight from the mask, so it stays O(1) between removals
+        return (abs(u[0] - v[0]) + abs(u[1] - v[1]) == 1 and self._walkable(u) and self._walkable(v)
+                and frozenset((u, v)) not in self.removed_edges)
+
+    def remove_node(self, cell):
+        if not self._walkable(cell):
+            raise KeyError(cell)
+        self.walk[cell] = False
+        self.attrs.pop(cell, None)
+        self.removed_edges = {e for e in self.removed_edges if cell not in e}
+        self._stale = True
+        self._cells = None
+        self._nbrs = None
+
+    def remove_edge(self, u, v):
+        if not self.has_edge(u, v):
+            raise KeyError((u, v))
+        self.removed_edges.add(frozenset((u, v)))
+        self._stale = True
+        self._cells = None
+        self._nbrs = None
+
+    def copy(self):
+        G = GridGraph(self.walk.copy(), self.removed_edges)
+        G.attrs = {cell: dict(a) for cell, a in self.attrs.items()}
+        return G
+
+    def subgraph(self, cells):
+        """Graph induced by cells (a new graph, not a view)"""
+        walk = np.zeros_like(self.walk)
+        for r, c in cells:
+            walk[r, c] = True
+        walk &= self.walk
+        removed = [e for e in self.removed_edges if all(walk[x] for x in e)]
+        return GridGraph(walk, removed)
+
+    def to_networkx(self):
+        import networkx as nx
+        G = nx.Graph()
+        G.add_nodes_from(self.cells)
+        G.add_edges_from(self.edges())
+        return G
@@ -1,6 +1,7 @@
 import cv2 as cv
 import numpy as np
 import math
+import struct
 
 # Color mapping
 COLOR_MAP = {
@@ -19,14 +20,66 @@ IMG_MARGIN = 5
 BOX_SIZE = 50
 BOX_RADIUS = 3
 
-class ImageProcessor:
-    """Handles image to matrix conversion and visualization"""
-    
+# Reduced decoding
+#
+# Large uploads are detected on a smaller copy: JPEGs are decoded straight
+# to 1/2, 1/4 or 1/8 size, other formats are decoded once and shrunk in
+# memory. The coarsest scale whose cells are still MIN_CELL_PIXELS wide wins.
+MIN_CELL_PIXELS = 32    # smallest cell side, in pixels, detection is trusted at
+MIN_DECODE_SIDE = 256   # images are not reduced below this shorter side
+REDUCED_DECODE = {1: cv.IMREAD_COLOR, 2: cv.IMREAD_REDUCED_COLOR_2,
+                  4: cv.IMREAD_REDUCED_COLOR_4, 8: cv.IMREAD_REDUCED_COLOR_8}
+
+
+def image_size(data):
+    """(width, height) read from a PNG or JPEG header, None for anything else"""
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+    if data[:2] != b'\xff\xd8':
+        return None
+
+    # Walk the JPEG segments up to the start-of-frame marker
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>HH', data[i + 5:i + 9])
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            i += 2
+            continue
+        i += 2 + struct.unpack('>H', data[i + 2:i + 4])[0]
+    return None
+
+
+class BoardContext:
+    """Per-request drawing state of one board.
+
+    img_bgr is the last image read (at the size it was detected at) or
+    generated for the board, box_centers maps (row, col) to the pixel centre
+    of that cell in it, and original_img_bgr is the image draw_path_on_image
+    started from.
+    """
+
     def __init__(self):
-        self.last_img_bgr = None
-        self.last_box_centers = {}
+        self.img_bgr = None
+        self.box_centers = {}
         self.original_img_bgr = None
 
+
+class ImageProcessor:
+    """Handles image to matrix conversion and visualization.
+
+    Holds no state between calls, so one processor can serve concurrent
+    requests. Pass a BoardContext to keep the image and cell centres of a
+    board for the calls that follow.
+    """
+
     @staticmethod
     def draw_rounded_box(image, pt1, pt2, color, radius=BOX_RADIUS):
         """Draw a filled rounded rectangle on the image"""
@@ -57,59 +110,140 @@ class ImageProcessor:
         pts = np.array(pts, np.int32).reshape((-1, 1, 2))
         cv.fillPoly(img, [pts], color)
 
-    def _read_image_flex(self, source):
-        """Accepts either a numpy array (BGR), raw bytes, or a filesystem path and
-        returns a BGR numpy array.
-        """
-        if isinstance(source, np.ndarray):
-            return source
+    def _read_bytes(self, source):
+        """Encoded image bytes from raw bytes or a filesystem path, None if unreadable"""
         if isinstance(source, (bytes, bytearray)):
-            arr = np.frombuffer(source, dtype=np.uint8)
-            img = cv.imdecode(arr, cv.IMREAD_COLOR)
-            return img
+            return source
         if isinstance(source, str):
-            return cv.imread(source)
+            try:
+                with open(source, 'rb') as f:
+                    return f.read()
+            except OSError:
+                return None
         raise TypeError("Unsupported image source type")
-    
-    def img_to_matrix(self, image_path):
-        """Convert image to a matrix representation"""
-        img = self._read_image_flex(image_path)
-        self.last_img_bgr = img.copy()
 
+    def _decode_levels(self, data):
+        """Factors to try, coarsest first, and a decoder for each.
+
+        JPEGs are decoded at the reduced size directly. Other formats gain
+        nothing from a reduced decode, so they are decoded once and shrunk.
+        """
+        arr = np.frombuffer(data, np.uint8)
+        size = image_size(data)
+        if size is not None and data[:2] == b'\xff\xd8':
+            decode = lambda factor: cv.imdecode(arr, REDUCED_DECODE[factor])
+        else:
+            full = cv.imdecode(arr, cv.IMREAD_COLOR)
+            if full is None:
+                return [], None
+            size = full.shape[1], full.shape[0]
+            decode = lambda factor: full if factor == 1 else cv.resize(
+                full, None, fx=1 / factor, fy=1 / factor, interpolation=cv.INTER_AREA)
+
+        factors = [f for f in (8, 4, 2) if min(size) // f >= MIN_DECODE_SIDE]
+        return factors + [1], decode
+
+    @staticmethod
+    def _grid_index(centres, size):
+        """Row (or column) index of each centre along one axis.
+
+        Sorted centres more than half a cell apart start a new line. The
+        pitch is the median gap between neighbouring lines, ignoring gaps
+        that skip empty lines, so no cell size is assumed.
+        """
+        order = np.argsort(centres)
+        ordered = centres[order]
+        line = np.zeros(len(centres), dtype=int)
+        line[order] = np.concatenate(([0], np.cumsum(np.diff(ordered) > size / 2)))
+
+        lines = np.bincount(line, weights=centres) / np.bincount(line)
+        gaps = np.diff(lines)
+        if len(gaps) == 0:
+            return line
+        pitch = np.median(gaps[gaps < gaps.min() * 1.5])
+        return np.rint((lines - lines[0]) / pitch).astype(int)[line]
+
+    def _detect(self, img):
+        """Matrix, cell centres and median cell side (0 if the boxes are uneven) of a BGR image"""
         # Preprocessing
         hsv = cv.cvtColor(img, cv.COLOR_BGR2HSV)
-        v_channel = hsv[:, :, 2]
-        _, thresh = cv.threshold(v_channel, 80, 255, cv.THRESH_BINARY)
-        contours, _ = cv.findContours(thresh, cv.RETR_TREE, cv.CHAIN_APPROX_SIMPLE)
+        _, thresh = cv.threshold(cv.extractChannel(hsv, 2), 80, 255, cv.THRESH_BINARY)
+        _, _, stats, _ = cv.connectedComponentsWithStats(thresh, connectivity=8)
 
-        # Filter bbox
-        boxes = [cv.boundingRect(c) for c in contours if cv.contourArea(c) > 100]
-        boxes = [b for b in boxes if b[2] > 20 and b[3] > 20]
-        boxes.sort(key=lambda b: (b[1] // 50, b[0]))
+        # Filter bbox (label 0 is the background)
+        x, y, w, h, area = stats[1:].T
+        keep = (area > 100) & (w > 20) & (h > 20)
+        x, y, w, h, area = x[keep], y[keep], w[keep], h[keep], area[keep]
+        if not len(x):
+            return np.zeros((0, 0), dtype=int), {}, 0
+
+        # Mean saturation of each box's own pixels, summed from an integral image
+        # of the region the boxes span, so margins around the board are skipped
+        x0, y0, x1, y1 = x.min(), y.min(), (x + w).max(), (y + h).max()
+        sat = cv.integral(cv.bitwise_and(cv.extractChannel(hsv, 1)[y0:y1, x0:x1], thresh[y0:y1, x0:x1]), sdepth=cv.CV_64F)
+        bx, by = x - x0, y - y0
+        mean_s = (sat[by + h, bx + w] - sat[by, bx + w] - sat[by + h, bx] + sat[by, bx]) / area
 
         # Index map
-        ys = sorted(set(b[1] // 50 for b in boxes))
-        xs = sorted(set(b[0] // 50 for b in boxes))
-        matrix = np.zeros((len(ys), len(xs)), dtype=int)
-
-        # Matrix generation
-        for (x, y, w, h) in boxes:
-            roi_hsv = hsv[y:y+h, x:x+w]
-            mean_h, mean_s, mean_v = np.mean(roi_hsv.reshape(-1, 3), axis=0)
-            val = 2 if mean_s > 50 and mean_v > 60 else 1
-            row, col = ys.index(y // 50), xs.index(x // 50)
-            matrix[row, col] = val
-            self.last_box_centers[(row, col)] = (x + w / 2, y + h / 2)
+        cx, cy = x + w / 2, y + h / 2
+        rows = self._grid_index(cy, np.median(h))
+        cols = self._grid_index(cx, np.median(w))
+        matrix = np.zeros((rows.max() + 1, cols.max() + 1), dtype=int)
+        matrix[rows, cols] = np.where(mean_s > 50, 2, 1)
+
+        # Cells merged at a coarse scale show up as a lone or oversized box
+        uniform = len(x) > 1 and w.max() <= 1.25 * np.median(w) and h.max() <= 1.25 * np.median(h)
+        cell = float(np.median(np.minimum(w, h))) if uniform else 0
+
+        box_centers = {(int(r), int(c)): (float(px), float(py)) for r, c, px, py in zip(rows, cols, cx, cy)}
+        return matrix, box_centers, cell
+
+    def img_to_matrix(self, image_path, context=None, lap=None):
+        """Convert image to a matrix representation.
 
+        A decoded BGR array is used as given. Encoded images (bytes or a path)
+        are detected at the coarsest scale where cells stay MIN_CELL_PIXELS
+        wide, falling back to full size; None if they cannot be decoded.
+        lap, if given, is called with a stage name ("decode", "img_to_matrix")
+        as each step finishes, such as Trace.lap.
+        """
+        lap = lap or (lambda stage: None)
+        if isinstance(image_path, np.ndarray):
+            img = image_path
+            matrix, box_centers, _ = self._detect(img)
+        else:
+            data = self._read_bytes(image_path)
+            factors, decode = self._decode_levels(data) if data else ([], None)
+            lap('decode')
+            if not factors:
+                return None
+            while factors:
+                factor = factors.pop(0)
+                img = decode(factor)
+                lap('decode')
+                if img is None:
+                    return None
+                matrix, box_centers, cell = self._detect(img)
+                lap('img_to_matrix')
+                if cell >= MIN_CELL_PIXELS:
+                    break
+                # Cells seen too small here tell how much finer the next try must be
+                if cell:
+                    factors = [f for f in factors if f == 1 or cell * factor / f >= MIN_CELL_PIXELS]
+
+        if context is not None:
+            context.img_bgr = img.copy()
+            context.box_centers = box_centers
         return matrix
     
-    def generate_img(self, matrix):
+    def generate_img(self, matrix, context=None):
         rows, cols = matrix.shape
         img_h = rows * (BOX_SIZE + IMG_MARGIN) + IMG_MARGIN
         img_w = cols * (BOX_SIZE + IMG_MARGIN) + IMG_MARGIN
 
         # Background initialization
         bg_img = np.full((img_h, img_w, 3), COLOR_MAP[0], dtype=np.uint8)
+        box_centers = {}
 
         # Draw boxes
         for r in range(rows):
@@ -123,34 +257,38 @@ class ImageProcessor:
 
                 cx = x1 + BOX_SIZE / 2 + IMG_PADDING
                 cy = y1 + BOX_SIZE / 2 + IMG_PADDING
-                self.last_box_centers[(r, c)] = (cx, cy)
+                box_centers[(r, c)] = (cx, cy)
 
         # Add padding
         img = cv.copyMakeBorder(bg_img, IMG_PADDING, IMG_PADDING, IMG_PADDING, IMG_PADDING,
                                         cv.BORDER_CONSTANT, value=COLOR_MAP[0])
-        self.last_img_bgr = img.copy()
+        if context is not None:
+            context.img_bgr = img.copy()
+            context.box_centers = box_centers
 
         return img
 
-    def draw_path_on_image(self, matrix, path, start, finish):
-        """Draw the solution path on the last loaded image"""
-        if self.last_img_bgr is None:
-            raise ValueError("No image loaded. Call img_to_matrix first.")
-        
-        self.original_img_bgr = self.last_img_bgr.copy()
+    def draw_path_on_image(self, matrix, path, start, finish, context=None):
+        """Draw the solution path on a freshly generated image of the board"""
+        if context is None:
+            context = BoardContext()
+        elif context.img_bgr is not None:
+            context.original_img_bgr = context.img_bgr.copy()
+
         new_matrix = matrix.copy()
         for i in range(1, len(path)-1):
             r, c = path[i]
             new_matrix[r, c] = 4
         finish_r, finish_c = finish
         new_matrix[finish_r, finish_c] = 3
-        img = self.generate_img(new_matrix)
+        img = self.generate_img(new_matrix, context)
+        box_centers = context.box_centers
 
         # Prepare points
         pts = []
         for node in path:
-            if node in self.last_box_centers:
-                pts.append(tuple(map(int, self.last_box_centers[node])))
+            if node in box_centers:
+                pts.append(tuple(map(int, box_centers[node])))
             else:
                 pts.append(None)
 
@@ -164,9 +302,9 @@ class ImageProcessor:
 
         # Draw node markers
         for i, node in enumerate(path):
-            if node not in self.last_box_centers:
+            if node not in box_centers:
                 continue
-            cx, cy = map(int, self.last_box_centers[node])
+            cx, cy = map(int, box_centers[node])
             if i == 0 or node == start:
                 # Start node
                 cv.circle(img, (cx, cy), radius=16, color=COLOR_MAP[5], 
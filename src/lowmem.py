@@ -0,0 +1,372 @@
+from datetime import datetime
+
+# Deployment
+from src.connectivity import ArticulationValidator
+from src.ordering import order_candidates, resolve_tie_break
+# Local testing
+# from connectivity import ArticulationValidator
+# from ordering import order_candidates, resolve_tie_break
+
+# Low-Memory Search
+#
+# The graph engine pushes every sibling onto its deque with its own copy of
+# the path and visited set (and, for edge elimination, of visited_edge and
+# removed_edge), so memory grows with depth times branching. This engine runs
+# the same search, in the same order and with the same pruning, over one
+# shared state. A frame only holds the depth of its branch point, a mark into
+# the edge delta log, the finish cell and the index of the next sibling. The
+# sibling list itself is recomputed from the restored state when needed.
+
+
+class LowMemorySearch:
+    """Graph-engine search that keeps one path and a frame per branch point.
+
+    Edge elimination logs each edge it adds to visited_edge or removed_edge,
+    and backtracking undoes the log back to the frame's mark. stats, when
+    given, gets the usual counters plus peak_items (cells, edges and frame
+    fields held at the peak) and copy_items (what the copying stack would
+    have held at its peak), so the memory saved is copy_items - peak_items.
+    """
+
+    def __init__(self, G, start, greedy=False, forced=False, edge_elimination=False, validation=False,
+                 ordering="degree", tie_break=None, finish_node=None, budget=None, stats=None):
+        self.G = G
+        self.start = start
+        self.greedy = greedy
+        self.forced = forced
+        self.edge_elimination = edge_elimination
+        self.validation = validation
+        self.ordering = ordering
+        self.tie = resolve_tie_break(tie_break, start, G.nodes())
+        self.validator = ArticulationValidator(G) if validation else None
+        self.budget = budget
+        self.stats = stats
+        self.total_nodes = len(G.nodes())
+
+        self.path = [start]
+        self.visited = {start}
+        self.finish_node = finish_node
+
+        self.visited_edge = set()
+        self.removed_edge = {None}
+        self.log = []   # (edge set, edge) in the order edges were added
+        self.root_removals = []   # queued by _init_edges, propagated with the first state
+        if edge_elimination:
+            self._init_edges()
+
+    # Edge delta log
+
+    def _add(self, edges, edge):
+        if edge not in edges:
+            edges.add(edge)
+            self.log.append((edges, edge))
+
+    def _undo(self, mark):
+        log = self.log
+        while len(log) > mark:
+            edges, edge = log.pop()
+            edges.discard(edge)
+
+    def _restore(self, depth, mark, finish_node):
+        path, visited = self.path, self.visited
+        while len(path) > depth:
+            visited.discard(path.pop())
+        self._undo(mark)
+        self.finish_node = finish_node
+
+    def _step(self, node):
+        self.path.append(node)
+        self.visited.add(node)
+        return node
+
+    # Propagation, as in the graph loops of algo.py
+
+    def _init_edges(self):
+        G, start = self.G, self.start
+        self.degree_value = degree_value = {n: G.degree(n) for n in G.nodes()}
+        self.edge_value = edge_value = dict.fromkeys(G.nodes(), 0)
+
+        for node in list(G.nodes()):
+            required_degree = 1 if (node == start or degree_value[node] == 1) else 2
+            if degree_value[node] == required_degree:
+                edge_value[node] = required_degree
+                for nb in list(G.neighbors(node)):
+                    self.visited_edge.add(tuple(sorted((node, nb))))
+                    required_degree = 1 if (nb == start or G.degree(nb) == 1) else 2
+                    if edge_value[nb] < required_degree:
+                        edge_value[nb] += 1
+                    if edge_value[nb] == required_degree and degree_value[nb] > required_degree:
+                        self.root_removals.append(nb)
+
+    def _finish_at(self, node, cell):
+        """Pin cell as the finish if parity allows; False prunes the state"""
+        stats = self.stats
+        if self.finish_node:
+            if stats is not None:
+                stats.finish_prunes += 1
+            return False
+
+        n = self.total_nodes - len(self.visited) - 1
+        u, v = node
+        nu, nv = cell
+        if (n % 2 == 0) == ((u + v) % 2 != (nu + nv) % 2):
+            self.finish_node = cell
+            return True
+        if stats is not None:
+            stats.parity_prunes += 1
+        return False
+
+    def _forced_moves(self, node):
+        G, visited = self.G, self.visited
+        forced = True
+        while forced:
+            forced = False
+
+            while True:
+                neighbors = [nb for nb in G.neighbors(node) if nb not in visited]
+                if len(neighbors) == 1:
+                    node = self._step(neighbors[0])
+                    continue
+                break
+
+            neighbors = [nb for nb in G.neighbors(node) if nb not in visited]
+            forced_moves = []
+            for nb in neighbors:
+                forced_move = [nnb for nnb in G.neighbors(nb) if nnb not in visited and nnb != node]
+                if len(forced_move) == 1:
+                    forced_moves.append(nb)
+                    if not self.validation:
+                        break
+
+            if len(forced_moves) == 1 or (forced_moves and not self.validation):
+                node = self._step(forced_moves[0])
+                forced = True
+            elif len(forced_moves) > 1:
+                if not self._finish_at(node, forced_moves[0]):
+                    return node, False
+                node = self._step(forced_moves[0])
+                forced = True
+        return node, True
+
+    def _eliminate_edges(self, node):
+        G, start = self.G, self.start
+        visited_node, visited_edge, removed_edge = self.visited, self.visited_edge, self.removed_edge
+        # Each state propagates with its own queues, as in the graph engine
+        remove_list, append_list = self.root_removals, []
+        self.root_removals = []
+        degree_value, edge_value = self.degree_value, self.edge_value
+        validation = self.validation
+        valid_finish_node = True
+
+        step = True
+        while (remove_list or step) and valid_finish_node:
+            step = False
+
+            while True:
+                neighbors = [nb for nb in G.neighbors(node) if tuple(sorted((node, nb))) in visited_edge and nb not in visited_node]
+                if neighbors:
+                    node = self._step(neighbors[0])
+                    continue
+                break
+
+            while remove_list:
+                node_list = remove_list.pop()
+                for nb in list(G.neighbors(node_list)):
+                    edge = tuple(sorted((node_list, nb)))
+                    if edge not in visited_edge:
+                        self._add(removed_edge, edge)
+
+                        if validation:
+                            required_degree = 1 if (node_list == start or degree_value[node_list] == 1) else 2
+                            if degree_value[node_list] > required_degree:
+                                degree_value[node_list] -= 1
+                        else:
+                            degree_value[node_list] -= 1
+
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if degree_value[nb] > required_degree:
+                            degree_value[nb] -= 1
+
+                        if validation and degree_value[nb] == 1 and nb != start:
+                            if not self._finish_at(node, nb):
+                                valid_finish_node = False
+                                break
+
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if degree_value[nb] == required_degree:
+                            append_list.append(nb)
+
+            while append_list and valid_finish_node:
+                node_list = append_list.pop()
+                for nb in list(G.neighbors(node_list)):
+                    edge = tuple(sorted((node_list, nb)))
+                    if edge not in removed_edge:
+                        step = True
+                        self._add(visited_edge, edge)
+                        required_degree = 1 if (node_list == start or degree_value[node_list] == 1) else 2
+                        edge_value[node_list] = required_degree
+                        required_degree = 1 if (nb == start or degree_value[nb] == 1) else 2
+                        if edge_value[nb] < required_degree:
+                            edge_value[nb] += 1
+                        if edge_value[nb] == required_degree and degree_value[nb] > required_degree:
+                            remove_list.append(nb)
+
+        return node, valid_finish_node
+
+    def _settle(self):
+        """Propagate from the head; False if the state is pruned"""
+        stats = self.stats
+        node = self.path[-1]
+        depth_before = len(self.path)
+
+        alive = True
+        if self.edge_elimination:
+            node, alive = self._eliminate_edges(node)
+        elif self.forced:
+            node, alive = self._forced_moves(node)
+
+        if stats is not None:
+            stats.forced_moves += len(self.path) - depth_before
+        if not alive or not self.validation:
+            return alive
+
+        if stats is not None:
+            stats.validations += 1
+        removed_edge = self.removed_edge if self.edge_elimination else None
+        if not self.validator.validate(node, visited_node=self.visited, removed_edge=removed_edge):
+            if stats is not None:
+                stats.validation_rejections += 1
+            return False
+        return True
+
+    def _candidates(self):
+        """Children of the head in the order the graph engine pushes them"""
+        G, node, visited = self.G, self.path[-1], self.visited
+        neighbors = [nb for nb in G.neighbors(node) if nb not in visited]
+        if self.greedy:
+            neighbors = order_candidates(G, neighbors, visited, self.ordering, self.tie)
+        if self.edge_elimination:
+            neighbors = [nb for nb in neighbors if tuple(sorted((node, nb))) not in self.removed_edge]
+        return neighbors
+
+    def _held(self, frames):
+        return len(self.path) + len(self.visited) + len(self.visited_edge) + len(self.removed_edge) + 5 * frames
+
+    # Search
+
+    def run(self):
+        budget, stats = self.budget, self.stats
+        frames = []      # [depth, log mark, finish node, next sibling index, items per copied sibling]
+        pending = 0      # siblings the graph engine would have on its stack
+        copy_items = 0   # cells and edges those siblings would hold
+
+        while True:
+            if budget is not None and budget.spend(len(self.path)):
+                return False
+            if stats is not None:
+                stats.peak_stack = max(stats.peak_stack, pending + 1)
+                stats.peak_items = max(stats.peak_items, self._held(len(frames)))
+                stats.copy_items = max(stats.copy_items, copy_items + self._held(0))
+
+            if self._settle():
+                if len(self.path) == self.total_nodes:
+                    return True
+                candidates = self._candidates()
+                if candidates:
+                    # The graph engine pops the last pushed sibling first
+                    size = 2 * (len(self.path) + 1)
+                    if self.edge_elimination:
+                        size += len(self.visited_edge) + len(self.removed_edge)
+                    frames.append([len(self.path), len(self.log), self.finish_node, len(candidates) - 2, size])
+                    pending += len(candidates) - 1
+                    copy_items += (len(candidates) - 1) * size
+                    self._step(candidates[-1])
+                    continue
+
+            # Back up to the deepest frame with a sibling left
+            while frames:
+                depth, mark, finish_node, idx, size = frame = frames[-1]
+                self._restore(depth, mark, finish_node)
+                if idx < 0:
+                    frames.pop()
+                    continue
+                frame[3] = idx - 1
+                pending -= 1
+                copy_items -= size
+                self._step(self._candidates()[idx])
+                break
+            else:
+                return False
+
+
+def _start_finish(G, start, stats=None):
+    """The forced finish cell of the validation variants, or False if the board is rejected"""
+    finish_node = None
+    for node in G.nodes():
+        if G.degree(node) == 1 and node != start:
+            if finish_node:
+                if stats is not None:
+                    stats.finish_prunes += 1
+                return False
+            finish_node = node
+
+    if finish_node:
+        u, v = start
+        nu, nv = finish_node
+        if (len(G.nodes()) % 2 == 0) != ((u + v) % 2 != (nu + nv) % 2):
+            if stats is not None:
+                stats.parity_prunes += 1
+            return False
+    return finish_node
+
+
+def _lowmem_search(G, start, validation=False, stats=None, **features):
+    time_start = datetime.now()
+
+    solution_path = []
+    finished = False
+    finish_node = None
+
+    start_finish = _start_finish(G, start, stats) if validation else None
+    if start_finish is False:
+        return solution_path, finished, finish_node, "0.000000 s (0.000 ms)"
+
+    search = LowMemorySearch(G, start, validation=validation, finish_node=start_finish, stats=stats, **features)
+    if search.run():
+        solution_path = search.path
+        finished = True
+        finish_node = solution_path[-1]
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+
+    return solution_path, finished, finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
+
+
+# Low-memory variants of the six algorithms in algo.py
+
+def lowmem_backtracking_dfs(G, start, budget=None, stats=None):
+    return _lowmem_search(G, start, budget=budget, stats=stats)
+
+
+def lowmem_greedy_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _lowmem_search(G, start, greedy=True, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def lowmem_forced_move_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _lowmem_search(G, start, greedy=True, forced=True, ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def lowmem_edge_elimination_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _lowmem_search(G, start, greedy=True, edge_elimination=True, ordering=ordering, tie_break=tie_break,
+                          budget=budget, stats=stats)
+
+
+def lowmem_validation_forced_move_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _lowmem_search(G, start, greedy=True, forced=True, validation=True, ordering=ordering, tie_break=tie_break,
+                          budget=budget, stats=stats)
+
+
+def lowmem_validation_edge_elimination_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _lowmem_search(G, start, greedy=True, edge_elimination=True, validation=True, ordering=ordering,
+                          tie_break=tie_break, budget=budget, stats=stats)
@@ -0,0 +1,86 @@
+import random
+from collections import OrderedDict
+
+# Zobrist Hashing
+
+class ZobristKeys:
+    """Random 64-bit keys per cell and per edge.
+
+    A search state hashes to the XOR of the keys of its visited cells, head,
+    finish, cut edges and fixed edges, so each move or undo updates the hash
+    with a single XOR. The same seed on the same board gives the same keys,
+    which lets a table outlive one search (restarts, repeated solves).
+    """
+
+    def __init__(self, cells, edges, seed=0):
+        rng = random.Random(seed)
+        self.visit = [rng.getrandbits(64) for _ in range(cells)]
+        self.head = [rng.getrandbits(64) for _ in range(cells)]
+        self.finish = [rng.getrandbits(64) for _ in range(cells)]
+        self.cut = [rng.getrandbits(64) for _ in range(edges)]
+        self.fix = [rng.getrandbits(64) for _ in range(edges)]
+
+
+# Dead-State Table
+
+ENTRY_BYTES = 120   # one int key in an OrderedDict slot, measured on CPython 3.11
+
+class DeadStateTable:
+    """Bounded memo of states proven to have no Hamiltonian completion.
+
+    Keys are Zobrist hashes. When the budget is full the least recently used
+    entry is evicted. Dead is relative to the pruning rules in force, so use
+    one table per board and algorithm.
+    """
+
+    def __init__(self, max_entries=100_000, max_bytes=None):
+        if max_bytes is not None:
+            max_entries = max_bytes // ENTRY_BYTES
+        if max_entries < 1:
+            raise ValueError("DeadStateTable needs room for at least one entry")
+
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def store(self, key):
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            return
+        entries[key] = None
+        self.stores += 1
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "approx_bytes": len(self.entries) * ENTRY_BYTES,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
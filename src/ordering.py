@@ -0,0 +1,72 @@
+import functools
+
+# Move Ordering
+#
+# Solvers push candidates in sorted order and pop from the end, so the
+# candidate with the smallest key is explored first.
+
+ORDERINGS = ("degree", "warnsdorff")
+
+
+def board_shape(cells):
+    rows = max(r for r, _ in cells) + 1
+    cols = max(c for _, c in cells) + 1
+    return rows, cols
+
+
+# Tie-breakers are partials of module-level functions so they pickle into
+# worker processes (portfolio, parallel engine) under any start method.
+
+def _wall_distance(shape, cell):
+    rows, cols = shape
+    return min(cell[0], cell[1], rows - 1 - cell[0], cols - 1 - cell[1])
+
+
+def _start_distance(start, cell):
+    return abs(cell[0] - start[0]) + abs(cell[1] - start[1])
+
+
+def wall_distance(shape):
+    """Tie-breaker preferring cells close to the board edge"""
+    return functools.partial(_wall_distance, shape)
+
+
+def start_distance(start):
+    """Tie-breaker preferring cells close to the start cell"""
+    return functools.partial(_start_distance, start)
+
+
+TIE_BREAKERS = {
+    "wall": lambda start, shape: wall_distance(shape),
+    "start": lambda start, shape: start_distance(start),
+}
+
+
+def resolve_tie_break(tie_break, start, cells):
+    """Turn a tie-breaker name or callable(cell) into a key function (or None)"""
+    if tie_break is None:
+        return None
+    if callable(tie_break):
+        return tie_break
+    if tie_break not in TIE_BREAKERS:
+        raise ValueError(f"Unknown tie-breaker: {tie_break}")
+    return TIE_BREAKERS[tie_break](start, board_shape(cells))
+
+
+def order_candidates(G, neighbors, visited, ordering="degree", tie=None):
+    """Sort candidates into push order for the networkx stack solvers.
+
+    "degree" ranks by static degree in the full graph, "warnsdorff" by the
+    number of still-unvisited neighbours.
+    """
+    if ordering == "warnsdorff":
+        def primary(x):
+            return sum(1 for nb in G.neighbors(x) if nb not in visited)
+    elif ordering == "degree":
+        primary = G.degree
+    else:
+        raise ValueError(f"Unknown ordering: {ordering}")
+
+    if tie is None:
+        return sorted(neighbors, key=primary, reverse=True)
+    return sorted(neighbors, key=lambda x: (primary(x), tie(x)), reverse=True)
@@ -0,0 +1,155 @@
+import os
+import multiprocessing as mp
+from datetime import datetime
+
+# Deployment
+from src.budget import Budget
+from src.stats import SearchStats
+from src.trail import TrailSearch
+# Local testing
+# from budget import Budget
+# from stats import SearchStats
+# from trail import TrailSearch
+
+# Parallel Frontier Search
+#
+# The search tree is expanded a few branching levels deep in the parent, and
+# every state on that frontier becomes one task for a process pool. Tasks are
+# handed out in small chunks as workers free up, so a worker that drew an easy
+# subtree simply takes the next one. The first worker to find a full path
+# sets a shared stop flag, and the others notice it within 1024 moves.
+
+FEATURES = {
+    "forced_move": dict(greedy=True, forced=True),
+    "edge_elimination": dict(greedy=True, edge_elimination=True),
+    "validation_forced_move": dict(greedy=True, forced=True, validation=True),
+    "validation_edge_elimination": dict(greedy=True, edge_elimination=True, validation=True),
+}
+
+_worker = {}
+
+
+def _init_worker(G, start, features, stop, max_nodes):
+    # Each worker alone may not exceed the node limit; the parent enforces the total
+    budget = Budget(max_nodes=max_nodes) if max_nodes is not None else None
+    search = TrailSearch(G, start, budget=budget, **features)
+    search.cancel = stop.is_set
+    _worker["search"] = search
+    _worker["stop"] = stop
+
+
+def _solve_subtree(prefix):
+    search = _worker["search"]
+    if _worker["stop"].is_set():
+        return os.getpid(), 0, None, 0, False, None
+
+    search._rollback(0)
+    search.stats = SearchStats()
+    nodes_before = search.nodes
+    path = None
+    if search.run(prefix):
+        path = [search.cells[i] for i in search.path]
+        _worker["stop"].set()
+    gave_up = search.budget is not None and search.budget.gave_up
+    return os.getpid(), search.nodes - nodes_before, path, len(search.path), gave_up, search.stats.as_dict()
+
+
+def parallel_dfs(G, start, algorithm="validation_forced_move", workers=None, frontier_depth=None, chunk_size=1,
+                 ordering="degree", tie_break=None, report=None, budget=None, stats=None):
+    """Split one board's search across a process pool.
+
+    With frontier_depth None, the frontier is deepened until it holds at least
+    four subtrees per worker. A budget is spent by the parent's expansion and
+    by every finished subtree, and its deadline and cancel token are polled
+    while the workers run. If `report` is a dict it receives "workers" (node
+    count per worker process), "frontier_nodes" (nodes the parent spent
+    expanding), "subtrees" and "frontier_depth". stats gets the pruning
+    counters of the parent and every subtree, and stats.workers the node
+    count of each worker too, added position by position when the same stats
+    is used for several solves (split blocks, restart attempts).
+    """
+    time_start = datetime.now()
+    workers = workers or os.cpu_count() or 1
+    features = dict(FEATURES[algorithm], ordering=ordering, tie_break=tie_break)
+
+    solution_path = []
+    finished = False
+    finish_node = None
+    worker_nodes = {}
+
+    search = TrailSearch(G, start, budget=budget, stats=stats, **features)
+    depth = frontier_depth or 1
+    while True:
+        prefixes, solved = search.frontier(depth)
+        if solved or frontier_depth or not prefixes or len(prefixes) >= 4 * workers or depth >= len(search.cells):
+            break
+        depth += 1
+
+    if solved:
+        solution_path = [search.cells[i] for i in search.path]
+        finished = True
+    elif prefixes:
+        ctx = mp.get_context()
+        stop = ctx.Event()
+        max_nodes = budget.max_nodes if budget is not None else None
+        with ctx.Pool(min(workers, len(prefixes)), initializer=_init_worker, initargs=(G, start, features, stop, max_nodes)) as pool:
+            results = pool.imap_unordered(_solve_subtree, prefixes, chunksize=chunk_size)
+            for _ in prefixes:
+                while True:
+                    try:
+                        pid, nodes, path, depth_reached, gave_up, counts = results.next(timeout=0.05)
+                        break
+                    except mp.TimeoutError:
+                        if budget is not None and budget.check():
+                            stop.set()
+
+                worker_nodes[pid] = worker_nodes.get(pid, 0) + nodes
+                if stats is not None and counts is not None:
+                    stats.merge(counts)
+                if path and not finished:
+                    solution_path = path
+                    finished = True
+                if budget is not None and not finished:
+                    if gave_up:
+                        budget.give_up("nodes")
+                    if budget.spend(depth_reached, nodes):
+                        stop.set()
+
+    if finished:
+        finish_node = solution_path[-1]
+
+    if stats is not None:
+        for i, nodes in enumerate(worker_nodes.values()):
+            if i < len(stats.workers):
+                stats.workers[i] += nodes
+            else:
+                stats.workers.append(nodes)
+
+    if report is not None:
+        report["workers"] = list(worker_nodes.values())
+        report["frontier_nodes"] = search.nodes
+        report["subtrees"] = len(prefixes)
+        report["frontier_depth"] = depth
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+
+    return solution_path, finished, finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
+
+
+# Parallel variants of the pruning algorithms in algo.py
+
+def parallel_forced_move_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return parallel_dfs(G, start, "forced_move", ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def parallel_edge_elimination_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return parallel_dfs(G, start, "edge_elimination", ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def parallel_validation_forced_move_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return parallel_dfs(G, start, "validation_forced_move", ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def parallel_validation_edge_elimination_dfs(G, start, ordering="degree", tie_break=None, budget=None, stats=None):
+    return parallel_dfs(G, start, "validation_edge_elimination", ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
@@ -0,0 +1,118 @@
+import queue
+import multiprocessing as mp
+from datetime import datetime
+
+# Deployment
+from src.budget import Budget
+from src.algo import backtracking_dfs, greedy_dfs, forced_move_dfs, edge_elimination_dfs, validation_forced_move_dfs, validation_edge_elimination_dfs, propagation_dfs
+# Local testing
+# from budget import Budget
+# from algo import backtracking_dfs, greedy_dfs, forced_move_dfs, edge_elimination_dfs, validation_forced_move_dfs, validation_edge_elimination_dfs, propagation_dfs
+
+# Algorithm Portfolio
+#
+# Runs several solvers on the same board in separate processes and keeps the
+# first solution. The other workers are terminated as soon as one succeeds.
+
+SOLVERS = {
+    "backtracking": (backtracking_dfs, "Backtracking DFS"),
+    "greedy": (greedy_dfs, "Greedy DFS"),
+    "forced_move": (forced_move_dfs, "Forced Move DFS"),
+    "edge_elimination": (edge_elimination_dfs, "Edge Elimination DFS"),
+    "validation_forced_move": (validation_forced_move_dfs, "Validation Forced Move DFS"),
+    "validation_edge_elimination": (validation_edge_elimination_dfs, "Validation Edge Elimination DFS"),
+    "propagation": (propagation_dfs, "Propagation DFS"),
+}
+
+PORTFOLIO = ("forced_move", "edge_elimination", "validation_forced_move", "validation_edge_elimination")
+
+
+def format_elapsed(time_start):
+    elapsed_s = (datetime.now() - time_start).total_seconds()
+    return f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
+
+
+def _portfolio_worker(name, G, start, options, results):
+    budget = options.get("budget")
+    try:
+        path, finished, finish_node, time_elapsed = SOLVERS[name][0](G, start, **options)
+        gave_up = budget.reason if budget is not None and budget.gave_up else None
+        results.put((name, path, finished, finish_node, time_elapsed, gave_up, budget.stats() if budget else None))
+    except Exception as e:
+        results.put((name, None, False, None, f"error: {e}", None, None))
+
+
+def portfolio_dfs(G, start, solvers=PORTFOLIO, report=None, budget=None, **options):
+    """Race `solvers` (keys of SOLVERS) on one board, first solution wins.
+
+    `options` (engine, split, ...) go to every solver. If `report` is a dict
+    it receives "winner" (display name or None) and "runs", a list of
+    (display name, status, time) with status "won", "no path", "gave up",
+    "error" or "cancelled". A board is only reported unsolvable once every
+    solver has finished without a path. With a budget, each solver gets its
+    own copy of the time and node limits, and the parent polls the deadline
+    and cancel token and stops every worker when they trip.
+    """
+    time_start = datetime.now()
+    if options.get("engine") == "parallel":
+        options["engine"] = "trail"   # daemonic workers cannot start pools of their own
+
+    ctx = mp.get_context()
+    results = ctx.Queue()
+    workers = {}
+    for name in solvers:
+        if budget is not None:
+            options["budget"] = Budget(time_limit=budget.remaining(), max_nodes=budget.max_nodes)
+        p = ctx.Process(target=_portfolio_worker, args=(name, G, start, options, results), daemon=True)
+        p.start()
+        workers[name] = p
+
+    solution_path = []
+    finished = False
+    finish_node = None
+    winner = None
+    runs = {}
+    reasons = []   # why solvers that hit their own limits gave up
+
+    try:
+        while len(runs) < len(workers):
+            try:
+                name, path, solved, node, time_elapsed, gave_up, stats = results.get(timeout=0.1)
+            except queue.Empty:
+                # a worker killed from outside (e.g. out of memory) never reports
+                for name, p in workers.items():
+                    if name not in runs and p.exitcode not in (None, 0):
+                        runs[name] = ("error", format_elapsed(time_start))
+                if budget is not None and budget.check():
+                    break
+                continue
+
+            if stats is not None:
+                budget.nodes += stats["nodes"]
+                budget.max_depth = max(budget.max_depth, stats["max_depth"])
+            if solved:
+                solution_path, finished, finish_node, winner = path, True, node, name
+                runs[name] = ("won", time_elapsed)
+                break
+            if gave_up:
+                runs[name] = ("gave up", time_elapsed)
+                reasons.append(gave_up)
+            else:
+                runs[name] = ("error" if path is None else "no path", time_elapsed)
+    finally:
+        for name, p in workers.items():
+            if p.is_alive():
+                p.terminate()
+                runs.setdefault(name, ("cancelled", format_elapsed(time_start)))
+        for p in workers.values():
+            p.join()
+        results.close()
+
+    if reasons and not finished:
+        budget.give_up(reasons[0])
+
+    if report is not None:
+        report["winner"] = SOLVERS[winner][1] if winner else None
+        report["runs"] = [(SOLVERS[name][1], *runs[name]) for name in solvers if name in runs]
+
+    return solution_path, finished, finish_node, format_elapsed(time_start)
@@ -0,0 +1,93 @@
+from collections import deque
+
+# Deployment
+from src.connectivity import ArticulationValidator
+from src.grid import GridGraph
+# Local testing
+# from connectivity import ArticulationValidator
+# from grid import GridGraph
+
+# Infeasibility Pre-check
+#
+# Necessary conditions for a Hamiltonian path that starts at `start`, run
+# cheapest first. A board that fails any of them has no solution, so the
+# solvers can return at once instead of searching it exhaustively.
+
+PRECHECK_MESSAGES = {
+    "disconnected": "Some cells cannot be reached from the start cell.",
+    "endpoints": "More than one dead-end cell besides the start, but a path has only one end.",
+    "colour": "Checkerboard colours are unbalanced, so no path from the start can alternate through every cell.",
+    "parity": "The only possible finish cell has the wrong checkerboard colour for the number of cells.",
+    "articulation": "A cut cell splits the board into parts that cannot all be visited in one pass.",
+}
+
+
+def _grid_reach(G, start):
+    """Cells reached from start and the degree-1 cells, read from the CSR arrays of a GridGraph"""
+    cells = G.cells
+    offsets, targets = G.offsets.tolist(), G.targets.tolist()
+    seen = bytearray(len(cells))
+    i = G.id_of[start]
+    seen[i] = 1
+    queue = deque([i])
+    reached = 1
+    while queue:
+        u = queue.popleft()
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if not seen[v]:
+                seen[v] = 1
+                reached += 1
+                queue.append(v)
+    return reached, [cells[i] for i in (G.degrees == 1).nonzero()[0].tolist()]
+
+
+def precheck_board(G, start):
+    """Return the name of the first rule the board fails, or None if it may be solvable"""
+    total_nodes = G.number_of_nodes()
+    if total_nodes <= 1:
+        return None
+
+    # Connectivity
+    if isinstance(G, GridGraph):
+        reached, ends = _grid_reach(G, start)
+    else:
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for nb in G.neighbors(node):
+                if nb not in seen:
+                    seen.add(nb)
+                    queue.append(nb)
+        reached = len(seen)
+        ends = [node for node in G.nodes() if G.degree(node) == 1]
+    if reached < total_nodes:
+        return "disconnected"
+
+    # Forced endpoints
+    finish_node = None
+    for node in ends:
+        if node != start:
+            if finish_node:
+                return "endpoints"
+            finish_node = node
+
+    # Checkerboard colour balance: the path alternates colours, so the start's
+    # colour owns ceil(n / 2) cells and the other colour the rest
+    u, v = start
+    start_colour = (u + v) % 2
+    same = sum(1 for r, c in G.nodes() if (r + c) % 2 == start_colour)
+    if same != (total_nodes + 1) // 2:
+        return "colour"
+
+    # Finish parity: the last cell shares the start's colour iff n is odd
+    if finish_node:
+        nu, nv = finish_node
+        if ((nu + nv) % 2 == start_colour) != (total_nodes % 2 == 1):
+            return "parity"
+
+    # Cut-vertex structure
+    if not ArticulationValidator(G).validate(start):
+        return "articulation"
+
+    return None
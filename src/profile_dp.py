@@ -0,0 +1,225 @@
+import numpy as np
+from datetime import datetime
+
+# Broken-Profile DP
+#
+# Cells are swept in row-major order over the board turned so that its
+# narrow side (at most MAX_WIDTH cells) runs across. The state is the set of
+# path edges crossing the frontier: W + 1 plugs, where plug c is the down
+# edge of a cell already swept in column c (or the edge coming down into
+# column c from the row above), and plug c + 1 is the edge coming in from the
+# left. Each plug is 0 (none), 1 / 2 (the two ends of a fragment, matched like
+# brackets) or 3 (a fragment whose other end is the start or the finish).
+# The state also records whether the free finish cell has been placed.
+#
+# The number of states depends only on the width, so time and memory are
+# linear in the long side. Counts are summed per state, and one history is
+# kept per state so a path can be read back from the final state.
+
+MAX_WIDTH = 10
+
+
+def _partner(plugs, i):
+    """Position of the bracket matching plugs[i] (1 looks right, 2 looks left)"""
+    step = 1 if plugs[i] == 1 else -1
+    depth = 0
+    j = i
+    while True:
+        if plugs[j] == 1:
+            depth += step
+        elif plugs[j] == 2:
+            depth -= step
+        if depth == 0:
+            return j
+        j += step
+
+
+def _moves(plugs, ended, c, is_start, can_down, can_right):
+    """Yield (plugs, ended, down, right) for one open cell"""
+    L, U = plugs[c], plugs[c + 1]
+    terminal = is_start or not ended   # the cell may be an end of the path
+    now_ended = ended if is_start else 1
+
+    def put(down, right):
+        q = list(plugs)
+        q[c], q[c + 1] = down, right
+        return q
+
+    if L == 0 and U == 0:
+        if not is_start and can_down and can_right:
+            yield put(1, 2), ended, True, True
+        if terminal:
+            if can_down:
+                yield put(3, 0), now_ended, True, False
+            if can_right:
+                yield put(0, 3), now_ended, False, True
+
+    elif L == 0 or U == 0:
+        x = L or U
+        if not is_start:
+            if can_down:
+                yield put(x, 0), ended, True, False
+            if can_right:
+                yield put(0, x), ended, False, True
+        if terminal:
+            q = put(0, 0)
+            if x == 3:
+                if not any(q):   # the whole path is closed off
+                    yield q, now_ended, False, False
+            else:
+                q[_partner(plugs, c if L else c + 1)] = 3
+                yield q, now_ended, False, False
+
+    elif not is_start:
+        q = put(0, 0)
+        if L == 3 and U == 3:
+            if not any(q):
+                yield q, ended, False, False
+        elif L == 3 or U == 3:
+            q[_partner(plugs, c + 1 if L == 3 else c)] = 3
+            yield q, ended, False, False
+        elif L == 1 and U == 1:
+            q[_partner(plugs, c + 1)] = 1
+            yield q, ended, False, False
+        elif L == 2 and U == 2:
+            q[_partner(plugs, c)] = 2
+            yield q, ended, False, False
+        elif L == 2 and U == 1:
+            yield q, ended, False, False
+        # L == 1 and U == 2 would close a cycle
+
+
+def _successors(key, c, W, is_open, is_start, can_down, can_right):
+    plugs = [key >> 2 * i & 3 for i in range(W + 1)]
+    ended = key >> 2 * (W + 1)
+    if not is_open:
+        if plugs[c] or plugs[c + 1]:
+            return ()
+        options = [(plugs, ended, False, False)]
+    else:
+        options = _moves(plugs, ended, c, is_start, can_down, can_right)
+
+    successors = []
+    for q, e, down, right in options:
+        if c == W - 1:
+            q = [0] + list(q[:W])   # next row starts with no edge from the left
+        new = e << 2 * (W + 1)
+        for i, x in enumerate(q):
+            new |= x << 2 * i
+        successors.append((new, down, right))
+    return successors
+
+
+def _sweep(mat, keep_path, budget=None):
+    arr = np.asarray(mat)
+    starts = np.argwhere(arr == 2)
+    if not len(starts):
+        return 0, None
+    start = tuple(int(x) for x in starts[-1])
+
+    # Crop the wall margin, then turn the board so the narrow side runs across
+    open_ = (arr == 1) | (arr == 2)
+    rows, cols = np.nonzero(open_)
+    top, left = int(rows.min()), int(cols.min())
+    open_ = open_[top:rows.max() + 1, left:cols.max() + 1]
+    start = (start[0] - top, start[1] - left)
+    transposed = open_.shape[1] > open_.shape[0]
+    if transposed:
+        open_ = open_.T
+        start = start[::-1]
+    H, W = open_.shape
+    if W > MAX_WIDTH:
+        raise ValueError(f"Profile DP needs a side of at most {MAX_WIDTH} cells, board is {H}x{W}")
+
+    def unturn(cell):
+        r, c = (cell[1], cell[0]) if transposed else cell
+        return r + top, c + left
+
+    if open_.sum() == 1:
+        return 1, [unturn(start)]
+
+    # States are packed 2 bits per plug, with the finish-placed flag on top.
+    # Each kept state also holds one history, a linked chain of (down, right)
+    # choices; chains share their common prefix and die with their state.
+    cells = open_.tolist()
+    states = {0: 1}
+    chains = {0: None}
+    seen = {}
+
+    for idx in range(H * W):
+        r, c = divmod(idx, W)
+        if budget is not None and budget.spend(idx, len(states)):
+            return None, None
+
+        nxt = {}
+        nxt_chains = {}
+        is_open = cells[r][c]
+        is_start = (r, c) == start
+        can_down = r + 1 < H and cells[r + 1][c]
+        can_right = c + 1 < W and cells[r][c + 1]
+        for key, count in states.items():
+            # Rows repeat the same states, so each transition is worked out once
+            where = (key, c, is_open, is_start, can_down, can_right)
+            successors = seen.get(where)
+            if successors is None:
+                successors = seen[where] = _successors(key, c, W, is_open, is_start, can_down, can_right)
+
+            for new, down, right in successors:
+                if new in nxt:
+                    nxt[new] += count
+                else:
+                    nxt[new] = count
+                    if keep_path:
+                        nxt_chains[new] = (down, right, chains[key])
+        states = nxt
+        chains = nxt_chains
+
+    final = 1 << 2 * (W + 1)
+    total = states.get(final, 0)
+    if not total or not keep_path:
+        return total, None
+
+    # Read the chosen down / right edges back from the final state's chain
+    nbrs = {}
+    chain = chains[final]
+    for idx in range(H * W - 1, -1, -1):
+        down, right, chain = chain
+        r, c = divmod(idx, W)
+        for other in ((r + 1, c) if down else None, (r, c + 1) if right else None):
+            if other:
+                nbrs.setdefault((r, c), []).append(other)
+                nbrs.setdefault(other, []).append((r, c))
+
+    path = [start]
+    prev = None
+    while True:
+        step = [n for n in nbrs[path[-1]] if n != prev]
+        if not step:
+            break
+        prev = path[-1]
+        path.append(step[0])
+    return total, [unturn(cell) for cell in path]
+
+
+def profile_dp(mat, budget=None, report=None):
+    """Solve a 0/1/2 matrix with the broken-profile DP; report gets "count" """
+    time_start = datetime.now()
+
+    count, path = _sweep(mat, keep_path=True, budget=budget)
+    solution_path = path or []
+    finished = bool(path)
+    finish_node = solution_path[-1] if finished else None
+
+    if report is not None:
+        report["count"] = count
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+
+    return solution_path, finished, finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
+
+
+def profile_count_solutions(mat, budget=None):
+    """Number of paths from the start that cover every cell (None if the budget ran out)"""
+    count, _ = _sweep(mat, keep_path=False, budget=budget)
+    return count
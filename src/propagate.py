@@ -0,0 +1,203 @@
+# Propagators
+#
+# The trail engine settles a state by running its propagators to a fixpoint.
+# Every change they make (a forced move, a cut or fixed edge, the finish cell
+# being pinned) goes through the search's undo trail, so backtracking restores
+# it exactly. Cells whose live degree changed are queued in search.dirty for
+# the propagators that need them.
+#
+# A propagator can hook into three places, each optional:
+#   propagate(search)                  -> False if the state is dead
+#   choose(search, move, candidates)   -> (move, candidates), or None if dead
+#   check(search)                      -> False if the settled state is dead
+# propagate runs before the head's candidates are listed, choose may force a
+# move or narrow the candidates, and check runs once nothing is forced.
+#
+# When the search has stats, a propagator that kills a state counts it there
+# the way the graph engine would: a second dead end is a finish prune, a
+# colour mismatch a parity prune, and each articulation check a validation.
+
+
+def _single_end(search):
+    """At most one free cell may have a single live edge, the finish"""
+    if len(search.ones) <= 1:
+        return True
+    _finish_prune(search)
+    return False
+
+
+def _finish_prune(search):
+    if search.stats is not None:
+        search.stats.finish_prunes += 1
+    return None
+
+
+class Propagator:
+    name = None
+    needs_dirty = False   # whether degree changes are queued in search.dirty
+
+    def propagate(self, search):
+        return True
+
+    def choose(self, search, move, candidates):
+        return move, candidates
+
+    def check(self, search):
+        return True
+
+
+class EdgeElimination(Propagator):
+    """Fix the edges of cells that must use all their live edges and cut the rest.
+
+    Runs once a free cell has a single live edge, which pins it as the finish.
+    After that, a fixed edge at the head is the forced next move.
+    """
+
+    name = "edges"
+    needs_dirty = True
+
+    def propagate(self, search):
+        if not search.ones:
+            search.dirty.clear()
+            return True
+        if search.finish == -1:
+            search._set_finish(next(iter(search.ones)))
+            search.dirty.extend(u for u in range(len(search.cells)) if search._alive(u))
+        if not self._fix_and_cut(search):
+            return False
+        return not search.zeros and _single_end(search)
+
+    def _fix_and_cut(self, search):
+        adj, cut, fixed, fixdeg, deg = search.adj, search.cut, search.fixed, search.fixdeg, search.deg
+        while search.dirty:
+            u = search.dirty.pop()
+            if not search._alive(u):
+                continue
+
+            required = search._required(u)
+            if fixdeg[u] > required:
+                return False
+
+            if deg[u] == required and fixdeg[u] < required:
+                for v, e in adj[u]:
+                    if not cut[e] and not fixed[e] and search._alive(v):
+                        search._fix(e, u, v)
+                if fixdeg[u] > required:
+                    return False
+
+            if fixdeg[u] == required and deg[u] > required:
+                for v, e in adj[u]:
+                    if not cut[e] and not fixed[e] and search._alive(v):
+                        search._cut(e, u, v)
+        return True
+
+    def choose(self, search, move, candidates):
+        if move == -1 and search.finish != -1:
+            for v, e in search.adj[search.head]:
+                if search.fixed[e] and not search.cut[e] and not search.visited[v]:
+                    return v, candidates
+        return move, candidates
+
+
+class DeadEnds(Propagator):
+    """Forced moves: no free cell may be cut off or become a second dead end.
+
+    A free cell with no live edge kills the state, and at most one free cell
+    (the finish) may have a single live edge. A neighbour of the head with
+    one other live edge must be entered now or it becomes a dead end.
+    """
+
+    name = "dead_ends"
+
+    def propagate(self, search):
+        return not search.zeros and _single_end(search)
+
+    def choose(self, search, move, candidates):
+        ones = search.ones
+        if search.free_count > 1 and any(v in ones for v in candidates):
+            return _finish_prune(search)
+        if move != -1:
+            return move, candidates
+
+        pass_through = [v for v in candidates if search.deg[v] == 2 and v not in ones]
+        if ones:
+            if len(pass_through) > 1:
+                return _finish_prune(search)
+            if pass_through:
+                return pass_through[0], candidates
+        elif len(pass_through) > 2:
+            return _finish_prune(search)
+        elif len(pass_through) == 2:
+            return move, pass_through
+        return move, candidates
+
+
+class Parity(Propagator):
+    """Checkerboard colour count of the free cells, and the finish cell's colour"""
+
+    name = "parity"
+
+    def check(self, search):
+        total = search.free_count + 1
+        head_black = search.black[search.head]
+        black_alive = search.black_free + head_black
+        same = black_alive if head_black else total - black_alive
+        if same != (total + 1) // 2:
+            return self._prune(search)
+
+        if search.ones:
+            end = next(iter(search.ones))
+            if bool(search.black[end]) != (bool(head_black) == (total % 2 == 1)):
+                return self._prune(search)
+        return True
+
+    @staticmethod
+    def _prune(search):
+        if search.stats is not None:
+            search.stats.parity_prunes += 1
+        return False
+
+
+class Articulation(Propagator):
+    """The alive cells must be connected, with cut cells only along one chain from the head"""
+
+    name = "articulation"
+
+    def check(self, search):
+        valid = search.validator.check(search.head, search.visited, search.cut, search.free_count + 1)
+        if search.stats is not None:
+            search.stats.validations += 1
+            if not valid:
+                search.stats.validation_rejections += 1
+        return valid
+
+
+PROPAGATORS = {p.name: p for p in (EdgeElimination, DeadEnds, Parity, Articulation)}
+
+# Settle order. Cuts and fixes come first so the dead-end rules see them, and
+# the cheap parity count runs before the Tarjan pass.
+ORDER = ("edges", "dead_ends", "parity", "articulation")
+
+
+def resolve_propagators(propagators):
+    """Instances for a list of propagator names (or instances), in settle order"""
+    resolved = []
+    for p in propagators:
+        if isinstance(p, str):
+            if p not in PROPAGATORS:
+                raise ValueError(f"Unknown propagator: {p}")
+            p = PROPAGATORS[p]()
+        resolved.append(p)
+    return sorted(resolved, key=lambda p: ORDER.index(p.name) if p.name in ORDER else len(ORDER))
+
+
+def propagators_for(forced=False, edge_elimination=False, validation=False):
+    """Propagator names matching the pruning of the algo.py solvers"""
+    names = []
+    if edge_elimination:
+        names.append("edges")
+    if forced or edge_elimination:
+        names.append("dead_ends")
+    if validation:
+        names += ["parity", "articulation"]
+    return names
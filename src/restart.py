@@ -0,0 +1,135 @@
+import random
+from datetime import datetime
+
+# Deployment
+from src.budget import Budget
+from src.ordering import resolve_tie_break
+# Local testing
+# from budget import Budget
+# from ordering import resolve_tie_break
+
+# Randomised Restarts
+#
+# DFS solve times are heavy-tailed: a bad choice near the root can cost
+# orders of magnitude more than a good one. Restart mode runs the solver in
+# attempts, each capped at a node count from a Luby or geometric schedule,
+# and starts over from the start cell with ties in the neighbour ordering
+# reshuffled when an attempt hits its cap. The first attempt keeps the
+# solver's own order, so boards it solves quickly are not slowed down.
+#
+# With a memo (trail engine), dead states stay in the table across attempts.
+# The trail search only stores a state once its whole subtree has failed, so
+# a subtree cut short by the cap is never recorded as dead.
+
+SCHEDULES = ("luby", "geometric")
+
+
+def luby(i):
+    """i-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ..."""
+    k = 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        if (1 << (k - 1)) <= i < (1 << k) - 1:
+            i -= (1 << (k - 1)) - 1
+            k = 1
+        else:
+            k += 1
+
+
+class RestartSchedule:
+    """Node caps for successive attempts and the seed for their tie shuffles"""
+
+    def __init__(self, kind="luby", base=512, factor=1.5, seed=0, max_attempts=None):
+        if kind not in SCHEDULES:
+            raise ValueError(f"Unknown restart schedule: {kind}")
+        self.kind = kind
+        self.base = base
+        self.factor = factor
+        self.seed = seed
+        self.max_attempts = max_attempts
+
+    def cap(self, attempt):
+        """Node cap of attempt 0, 1, 2, ..."""
+        if self.kind == "luby":
+            return self.base * luby(attempt + 1)
+        return int(self.base * self.factor ** attempt)
+
+    @classmethod
+    def resolve(cls, restarts):
+        """Turn restarts=True, a schedule name or a RestartSchedule into a schedule"""
+        if isinstance(restarts, cls):
+            return restarts
+        if restarts is True:
+            return cls()
+        return cls(kind=restarts)
+
+
+class ShuffledTieBreak:
+    """Tie key that keeps `tie` (if any) first and breaks what is left at random.
+
+    A class rather than a closure so it pickles into portfolio and parallel
+    workers. Each cell's random key depends only on the seed and the cell,
+    so every process sees the same order.
+    """
+
+    def __init__(self, tie, seed):
+        self.tie = tie
+        self.seed = seed
+        self.keys = {}
+
+    def __call__(self, cell):
+        key = self.keys.get(cell)
+        if key is None:
+            key = self.keys[cell] = random.Random(f"{self.seed}:{cell}").random()
+        return (self.tie(cell), key) if self.tie else key
+
+
+def restart_solve(G, start, solver, restarts=True, tie_break=None, budget=None, stats=None, **options):
+    """Run `solver` in capped attempts until one finishes or `budget` runs out.
+
+    An attempt that ends without hitting its cap is a full search, so its
+    answer (a path or no path) is final. The outer budget is charged with the
+    nodes of every attempt, and its deadline and cancel token apply to each.
+    stats.restarts counts the attempts after the first.
+    """
+    time_start = datetime.now()
+    schedule = RestartSchedule.resolve(restarts)
+    rng = random.Random(schedule.seed)
+    tie = resolve_tie_break(tie_break, start, G.nodes())
+
+    solution_path = []
+    finished = False
+    finish_node = None
+
+    attempt = 0
+    while schedule.max_attempts is None or attempt < schedule.max_attempts:
+        max_nodes = schedule.cap(attempt)
+        if budget is not None and budget.max_nodes is not None:
+            max_nodes = min(max_nodes, budget.max_nodes - budget.nodes)
+        attempt_budget = Budget(time_limit=budget.remaining() if budget is not None else None, max_nodes=max_nodes,
+                                cancel=budget.cancel if budget is not None else None)
+
+        attempt_tie = tie if attempt == 0 else ShuffledTieBreak(tie, rng.getrandbits(32))
+        path, solved, node, _ = solver(G, start, tie_break=attempt_tie, budget=attempt_budget, stats=stats, **options)
+
+        if budget is not None and budget.spend(attempt_budget.max_depth, attempt_budget.nodes) and not solved:
+            break
+        if solved:
+            solution_path, finished, finish_node = path, True, node
+            break
+        if not attempt_budget.gave_up:
+            break   # searched to the end: no path
+        if attempt_budget.reason != "nodes":
+            if budget is not None:
+                budget.give_up(attempt_budget.reason)
+            break
+
+        attempt += 1
+        if stats is not None:
+            stats.restarts += 1
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+
+    return solution_path, finished, finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
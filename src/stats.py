@@ -0,0 +1,101 @@
+import time
+import functools
+
+# Deployment
+from src.budget import Budget
+# Local testing
+# from budget import Budget
+
+# Search Statistics
+
+COUNTERS = ("forced_moves", "parity_prunes", "finish_prunes", "validations", "validation_rejections")
+
+class SearchStats:
+    """Counters for one solve, filled in when passed as stats= to a solver.
+
+    nodes and max_depth come from the solve's Budget. Every engine also
+    counts forced moves, states pruned by the parity and finish-node checks,
+    validator calls and rejections, and the peak size of its DFS stack (for
+    the trail and parallel engines, the peak number of untried siblings).
+    shortcut is "precheck" or "construct" when the board never reached a
+    search.
+
+    The low-memory engine fills the same counters, with peak_stack being the
+    stack the graph engine would have had, and adds peak_items (cells, edges
+    and frame fields it held at the peak) and copy_items (cells and edges the
+    graph engine's stack of copies would have held at its peak). restarts
+    counts the attempts after the first in restart mode, and workers holds
+    the nodes each worker process searched with the parallel engine.
+    """
+
+    __slots__ = ("nodes", "forced_moves", "parity_prunes", "finish_prunes", "validations", "validation_rejections",
+                 "max_depth", "peak_stack", "peak_items", "copy_items", "restarts", "workers", "time_ns", "shortcut", "running")
+
+    def __init__(self):
+        self.nodes = 0
+        self.forced_moves = 0
+        self.parity_prunes = 0
+        self.finish_prunes = 0
+        self.validations = 0
+        self.validation_rejections = 0
+        self.max_depth = 0
+        self.peak_stack = 0
+        self.peak_items = 0
+        self.copy_items = 0
+        self.restarts = 0
+        self.workers = []
+        self.time_ns = 0
+        self.shortcut = None
+        self.running = False
+
+    def merge(self, counts):
+        """Add the counters of another search, given as an as_dict() result"""
+        for name in COUNTERS:
+            setattr(self, name, getattr(self, name) + counts[name])
+        self.peak_stack = max(self.peak_stack, counts["peak_stack"])
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "running"}
+
+    def memory_saved(self):
+        """Items the low-memory engine did not have to hold (0 for other engines)"""
+        return max(0, self.copy_items - self.peak_items)
+
+    def __repr__(self):
+        return f"SearchStats({', '.join(f'{k}={v}' for k, v in self.as_dict().items())})"
+
+
+def collect_stats(solver):
+    """Let solver(G, start, ..., stats=SearchStats()) fill in the stats.
+
+    Without stats the solver runs untouched. With stats the solve is timed
+    with perf_counter_ns and gets a Budget (an unlimited one if none was
+    given) to count nodes. Nested calls, such as split mode solving each
+    block, add to the same stats and leave timing to the outermost call.
+    """
+
+    @functools.wraps(solver)
+    def wrapper(G, start, *args, stats=None, budget=None, **kwargs):
+        if stats is None:
+            return solver(G, start, *args, stats=stats, budget=budget, **kwargs)
+        if stats.running:
+            shortcut = stats.shortcut   # a block taking a shortcut is not the whole solve taking it
+            try:
+                return solver(G, start, *args, stats=stats, budget=budget, **kwargs)
+            finally:
+                stats.shortcut = shortcut
+
+        if budget is None:
+            budget = Budget()
+        nodes_before = budget.nodes
+        stats.running = True
+        time_start = time.perf_counter_ns()
+        try:
+            return solver(G, start, *args, stats=stats, budget=budget, **kwargs)
+        finally:
+            stats.time_ns += time.perf_counter_ns() - time_start
+            stats.running = False
+            stats.nodes += budget.nodes - nodes_before
+            stats.max_depth = max(stats.max_depth, budget.max_depth)
+
+    return wrapper
@@ -0,0 +1,69 @@
+import time
+import threading
+from collections import OrderedDict, deque
+
+# Request Tracing
+
+class Trace:
+    """Monotonic-clock spans for the stages of one request.
+
+    lap(stage) closes the span running since the previous lap (or since the
+    trace started) under that stage name. A stage lapped twice, such as the
+    two PNG encodes, adds up into one span. Times are in milliseconds.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter_ns()
+        self.last = self.started
+        self.spans = OrderedDict()
+
+    def lap(self, stage):
+        now = time.perf_counter_ns()
+        self.spans[stage] = self.spans.get(stage, 0.0) + (now - self.last) / 1e6
+        self.last = now
+
+    def total_ms(self):
+        return (time.perf_counter_ns() - self.started) / 1e6
+
+    def server_timing(self):
+        """The spans as a Server-Timing header value"""
+        return ", ".join(f"{stage};dur={ms:.3f}" for stage, ms in self.spans.items())
+
+
+class StageStats:
+    """Per-stage latency percentiles over the last `window` requests, kept in process"""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.samples = OrderedDict()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def record(self, trace, total_ms=None):
+        with self.lock:
+            self.requests += 1
+            spans = list(trace.spans.items()) + [("total", trace.total_ms() if total_ms is None else total_ms)]
+            for stage, ms in spans:
+                if stage not in self.samples:
+                    self.samples[stage] = deque(maxlen=self.window)
+                self.samples[stage].append(ms)
+
+    def summary(self):
+        """{stage: {"count", "p50_ms", "p99_ms", "mean_ms"}} with nearest-rank percentiles"""
+        with self.lock:
+            samples = {stage: sorted(values) for stage, values in self.samples.items()}
+        summary = {}
+        for stage, values in samples.items():
+            n = len(values)
+            summary[stage] = {
+                "count": n,
+                "p50_ms": values[max(0, -(-50 * n // 100) - 1)],
+                "p99_ms": values[max(0, -(-99 * n // 100) - 1)],
+                "mean_ms": sum(values) / n,
+            }
+        return summary
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+            self.requests = 0
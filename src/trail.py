@@ -0,0 +1,534 @@
+from datetime import datetime
+
+# Deployment
+from src.connectivity import ArticulationValidator
+from src.grid import GridGraph
+from src.memo import ZobristKeys
+from src.ordering import resolve_tie_break
+from src.propagate import Propagator, resolve_propagators, propagators_for
+# Local testing
+# from connectivity import ArticulationValidator
+# from grid import GridGraph
+# from memo import ZobristKeys
+# from ordering import resolve_tie_break
+# from propagate import Propagator, resolve_propagators, propagators_for
+
+# Trail record kinds
+MOVE, CUT, FIX, FINISH = range(4)
+
+
+# Undo-Trail Search
+
+class TrailSearch:
+    """Depth-first search over one shared state that is changed in place.
+
+    Every change (a move, a cut or fixed edge, the finish cell being pinned)
+    is pushed onto an undo trail, and backtracking pops the trail back to the
+    mark taken when the branch was entered. Frames only hold their candidate
+    list and the index of the next sibling, so peak memory is O(cells) no
+    matter how deep the search goes.
+
+    Pruning comes from a list of propagators (see propagate.py), given by
+    name or built from the forced / edge_elimination / validation flags of
+    the algo.py solvers. greedy orders the branching candidates.
+
+    With a DeadStateTable as memo, the Zobrist hash of the state after each
+    branching move is looked up before settling it and stored once its whole
+    subtree has failed.
+
+    With a SearchStats as stats, run() records forced moves and the peak
+    number of untried siblings, and the propagators count their prunes and
+    validator calls.
+    """
+
+    def __init__(self, G, start, greedy=False, forced=False, edge_elimination=False, validation=False, memo=None,
+                 ordering="degree", tie_break=None, budget=None, propagators=None, stats=None):
+        self.G = G
+        self.greedy = greedy
+        self.ordering = ordering
+        if propagators is None:
+            propagators = propagators_for(forced, edge_elimination, validation)
+        self.propagators = resolve_propagators(propagators)
+        self.choosers = [p for p in self.propagators if type(p).choose is not Propagator.choose]
+        self.checks = [p for p in self.propagators if type(p).check is not Propagator.check]
+        self.track_dirty = any(p.needs_dirty for p in self.propagators)
+        self.validator = ArticulationValidator(G) if any(p.name == "articulation" for p in self.propagators) else None
+
+        self.cells = list(G.nodes())
+        index = {cell: i for i, cell in enumerate(self.cells)}
+        n = len(self.cells)
+
+        self.adj = [[] for _ in range(n)]   # (neighbor, edge id)
+        self.edges = []
+        if isinstance(G, GridGraph):
+            # Read the CSR arrays directly: cell ids match and each row is already in neighbor order
+            offsets, targets = G.offsets.tolist(), G.targets.tolist()
+            for u in range(n):
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if v > u:
+                        e = len(self.edges)
+                        self.edges.append((self.cells[u], self.cells[v]))
+                        self.adj[u].append((v, e))
+                        self.adj[v].append((u, e))
+        else:
+            for u, v in G.edges():
+                e = len(self.edges)
+                self.edges.append((u, v))
+                self.adj[index[u]].append((index[v], e))
+                self.adj[index[v]].append((index[u], e))
+            # Keep the neighbor order of G so the trail engine explores like the graph engine
+            for i, cell in enumerate(self.cells):
+                order = {index[nb]: k for k, nb in enumerate(G.neighbors(cell))}
+                self.adj[i].sort(key=lambda x: order[x[0]])
+
+        self.static_degree = [len(a) for a in self.adj]
+        self.black = [1 if (r + c) % 2 == 0 else 0 for r, c in self.cells]
+        tie = resolve_tie_break(tie_break, start, self.cells)
+        self.tie = [tie(cell) for cell in self.cells] if tie else None
+
+        self.head = index[start]
+        self.path = [self.head]
+        self.visited = bytearray(n)
+        self.visited[self.head] = 1
+        self.cut = bytearray(len(self.edges))
+        self.fixed = bytearray(len(self.edges))
+        self.deg = list(self.static_degree)   # live edges to alive cells (unvisited or head)
+        self.fixdeg = [0] * n
+        self.finish = -1
+
+        self.free_count = 0
+        self.black_free = 0
+        self.ones = set()   # free cells with a single live edge (must be the finish)
+        self.zeros = 0      # free cells with no live edge (unreachable)
+        for u in range(n):
+            if u != self.head:
+                self._track(u, 1)
+
+        self.trail = []
+        self.dirty = []
+
+        self.nodes = 0          # branching moves tried
+        self.cancel = None      # callable polled during run(); True stops the search
+        self.budget = budget
+        self.stats = stats      # SearchStats filled by run() and the propagators, or None
+        self.cancelled = False
+
+        self.memo = memo
+        self.keys = None
+        self.hash = 0
+        if memo is not None:
+            self.keys = ZobristKeys(n, len(self.edges))
+            self.hash = self.keys.visit[self.head] ^ self.keys.head[self.head]
+
+    # In-place state changes
+
+    def _track(self, u, sign):
+        d = self.deg[u]
+        if d == 0:
+            self.zeros += sign
+        elif d == 1:
+            if sign > 0:
+                self.ones.add(u)
+            else:
+                self.ones.discard(u)
+        self.free_count += sign
+        self.black_free += sign * self.black[u]
+
+    def _adjust(self, u, delta):
+        if not self.visited[u]:
+            self._track(u, -1)
+            self.deg[u] += delta
+            self._track(u, 1)
+        else:
+            self.deg[u] += delta
+        if self.track_dirty:
+            self.dirty.append(u)
+
+    def _alive(self, u):
+        return not self.visited[u] or u == self.head
+
+    def _move(self, v):
+        h = self.head
+        self._track(v, -1)
+        self.visited[v] = 1
+        self.head = v
+        for w, e in self.adj[h]:
+            if not self.cut[e] and self._alive(w):
+                self._adjust(w, -1)
+                if self.fixed[e]:
+                    self.fixdeg[w] -= 1
+        self.path.append(v)
+        self.trail.append((MOVE, h, v))
+        if self.keys is not None:
+            self.hash ^= self.keys.visit[v] ^ self.keys.head[h] ^ self.keys.head[v]
+
+    def _cut(self, e, u, v):
+        self.cut[e] = 1
+        self._adjust(u, -1)
+        self._adjust(v, -1)
+        self.trail.append((CUT, e, u, v))
+        if self.keys is not None:
+            self.hash ^= self.keys.cut[e]
+
+    def _fix(self, e, u, v):
+        self.fixed[e] = 1
+        self.fixdeg[u] += 1
+        self.fixdeg[v] += 1
+        if self.track_dirty:
+            self.dirty.append(u)
+            self.dirty.append(v)
+        self.trail.append((FIX, e, u, v))
+        if self.keys is not None:
+            self.hash ^= self.keys.fix[e]
+
+    def _set_finish(self, f):
+        self.trail.append((FINISH, self.finish))
+        self.finish = f
+        if self.keys is not None:
+            self.hash ^= self.keys.finish[f]
+
+    def _rollback(self, mark):
+        trail = self.trail
+        keys = self.keys
+        while len(trail) > mark:
+            record = trail.pop()
+            kind = record[0]
+            if kind == MOVE:
+                _, h, v = record
+                if keys is not None:
+                    self.hash ^= keys.visit[v] ^ keys.head[h] ^ keys.head[v]
+                for w, e in self.adj[h]:
+                    if not self.cut[e] and self._alive(w):
+                        self._adjust(w, 1)
+                        if self.fixed[e]:
+                            self.fixdeg[w] += 1
+                self.head = h
+                self.path.pop()
+                self.visited[v] = 0
+                self._track(v, 1)
+            elif kind == CUT:
+                _, e, u, v = record
+                if keys is not None:
+                    self.hash ^= keys.cut[e]
+                self.cut[e] = 0
+                self._adjust(u, 1)
+                self._adjust(v, 1)
+            elif kind == FIX:
+                _, e, u, v = record
+                if keys is not None:
+                    self.hash ^= keys.fix[e]
+                self.fixed[e] = 0
+                self.fixdeg[u] -= 1
+                self.fixdeg[v] -= 1
+            else:
+                if keys is not None:
+                    self.hash ^= keys.finish[self.finish]
+                self.finish = record[1]
+        self.dirty.clear()
+
+    # Pruning
+
+    def _required(self, u):
+        return 1 if (u == self.head or u == self.finish) else 2
+
+    def _settle(self):
+        """Run the propagators to a fixpoint, making forced moves; leave the branching candidates in self.candidates"""
+        while True:
+            if self.free_count == 0:
+                self.candidates = []
+                return True
+
+            for p in self.propagators:
+                if not p.propagate(self):
+                    return False
+            self.dirty.clear()
+
+            head = self.head
+            candidates = [v for v, e in self.adj[head] if not self.visited[v] and not self.cut[e]]
+            if not candidates:
+                return False
+
+            move = -1
+            for p in self.choosers:
+                chosen = p.choose(self, move, candidates)
+                if chosen is None:
+                    return False
+                move, candidates = chosen
+
+            if move == -1 and len(candidates) == 1:
+                move = candidates[0]
+            if move == -1:
+                self.candidates = candidates
+                return True
+
+            self._move(move)
+            if self.stats is not None:
+                self.stats.forced_moves += 1
+
+    def _valid(self):
+        if self.free_count == 0:
+            return True
+        for p in self.checks:
+            if not p.check(self):
+                return False
+        return True
+
+    def _ordered(self, candidates):
+        # The stack engines push in this order and pop from the end
+        if self.greedy:
+            if self.ordering == "warnsdorff":
+                # Live degree counts the head, which every candidate touches
+                primary = self.deg
+            elif self.ordering == "degree":
+                primary = self.static_degree
+            else:
+                raise ValueError(f"Unknown ordering: {self.ordering}")
+
+            if self.tie is None:
+                candidates = sorted(candidates, key=lambda x: primary[x], reverse=True)
+            else:
+                candidates = sorted(candidates, key=lambda x: (primary[x], self.tie[x]), reverse=True)
+        return candidates[::-1]
+
+    # Search
+
+    def _replay(self, prefix):
+        """Settle the root, then follow the branching choices in prefix"""
+        if not self._settle() or not self._valid():
+            return False
+        for v in prefix:
+            self._move(v)
+            if not self._settle() or not self._valid():
+                return False
+        return True
+
+    def frontier(self, depth, prefix=()):
+        """Branching choices leading to every live state `depth` branches below prefix.
+
+        Returns (prefixes, solved) in the order run() would explore them. If a
+        full path turns up on the way, solved is True and the state is left on
+        it. Otherwise the state is rolled back to its initial position, also
+        when the budget runs out part way (check budget.gave_up).
+        """
+        if not self._replay(prefix):
+            self._rollback(0)
+            return [], False
+        if self.free_count == 0:
+            return [], True
+
+        prefixes = []
+        choices = list(prefix)
+        frames = [[len(self.trail), self._ordered(self.candidates), 0]]
+
+        while frames:
+            frame = frames[-1]
+            mark, candidates, idx = frame
+
+            if idx == len(candidates):
+                self._rollback(mark)
+                frames.pop()
+                if frames:
+                    choices.pop()
+                continue
+            frame[2] = idx + 1
+
+            self.nodes += 1
+            if self.budget is not None and self.budget.spend(len(self.path)):
+                self._rollback(0)
+                return [], False
+
+            branch_mark = len(self.trail)
+            v = candidates[idx]
+            self._move(v)
+
+            if self._settle() and self._valid():
+                if self.free_count == 0:
+                    return [], True
+                if len(frames) == depth:
+                    prefixes.append(choices + [v])
+                    self._rollback(branch_mark)
+                else:
+                    choices.append(v)
+                    frames.append([branch_mark, self._ordered(self.candidates), 0])
+            else:
+                self._rollback(branch_mark)
+
+        self._rollback(0)
+        return prefixes, False
+
+    def run(self, prefix=()):
+        if not self._replay(prefix):
+            return False
+        if self.free_count == 0:
+            return True
+
+        memo = self.memo
+        cancel = self.cancel
+        budget = self.budget
+        stats = self.stats
+        frames = [[len(self.trail), self._ordered(self.candidates), 0, None]]   # (trail mark, candidates, next sibling index, state key)
+        pending = len(self.candidates)   # siblings not tried yet, the graph engine's stack size
+
+        while frames:
+            frame = frames[-1]
+            mark, candidates, idx, key = frame
+
+            if idx == len(candidates):
+                if key is not None:
+                    memo.store(key)
+                self._rollback(mark)
+                frames.pop()
+                continue
+            frame[2] = idx + 1
+            if stats is not None:
+                stats.peak_stack = max(stats.peak_stack, pending)
+            pending -= 1
+
+            self.nodes += 1
+            if cancel is not None and not self.nodes & 1023 and cancel():
+                self.cancelled = True
+                return False
+            if budget is not None and budget.spend(len(self.path)):
+                return False
+
+            branch_mark = len(self.trail)
+            self._move(candidates[idx])
+
+            branch_key = None
+            if memo is not None:
+                branch_key = self.hash
+                if memo.lookup(branch_key):
+                    self._rollback(branch_mark)
+                    continue
+
+            if self._settle() and self._valid():
+                if self.free_count == 0:
+                    return True
+                frames.append([branch_mark, self._ordered(self.candidates), 0, branch_key])
+                pending += len(self.candidates)
+            else:
+                if branch_key is not None:
+                    memo.store(branch_key)
+                self._rollback(branch_mark)
+
+        return False
+
+    def _complete(self, prefix=()):
+        """Yield once per full path below prefix, with the path left in self.path.
+
+        Same pruning as run(), but the search carries on after each solution.
+        The dead-state memo is not used: a frame that produced solutions is
+        not dead, so its exhaustion proves nothing.
+        """
+        if not self._replay(prefix):
+            return
+        if self.free_count == 0:
+            yield True
+            return
+
+        budget = self.budget
+        frames = [[len(self.trail), self._ordered(self.candidates), 0]]   # (trail mark, candidates, next sibling index)
+
+        while frames:
+            frame = frames[-1]
+            mark, candidates, idx = frame
+
+            if idx == len(candidates):
+                self._rollback(mark)
+                frames.pop()
+                continue
+            frame[2] = idx + 1
+
+            self.nodes += 1
+            if budget is not None and budget.spend(len(self.path)):
+                return
+
+            branch_mark = len(self.trail)
+            self._move(candidates[idx])
+
+            if self._settle() and self._valid():
+                if self.free_count == 0:
+                    yield True
+                    self._rollback(branch_mark)
+                else:
+                    frames.append([branch_mark, self._ordered(self.candidates), 0])
+            else:
+                self._rollback(branch_mark)
+
+    def solutions(self, prefix=()):
+        """Generate every Hamiltonian path from the start as a list of cells"""
+        cells = self.cells
+        for _ in self._complete(prefix):
+            yield [cells[i] for i in self.path]
+
+    def count(self, prefix=()):
+        """Number of Hamiltonian paths from the start, without building any of them"""
+        return sum(1 for _ in self._complete(prefix))
+
+
+def _trail_search(G, start, **features):
+    time_start = datetime.now()
+
+    solution_path = []
+    finished = False
+    finish_node = None
+
+    search = TrailSearch(G, start, **features)
+    if search.run():
+        solution_path = [search.cells[i] for i in search.path]
+        finished = True
+        finish_node = solution_path[-1]
+
+    time_finished = datetime.now() - time_start
+    elapsed_s = time_finished.total_seconds()
+
+    return solution_path, finished, finish_node, f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)"
+
+
+# Undo-trail variants of the six algorithms in algo.py
+
+def trail_backtracking_dfs(G, start, memo=None, budget=None, stats=None):
+    return _trail_search(G, start, memo=memo, budget=budget, stats=stats)
+
+
+def trail_greedy_dfs(G, start, memo=None, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _trail_search(G, start, greedy=True, memo=memo,
+                         ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def trail_forced_move_dfs(G, start, memo=None, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _trail_search(G, start, greedy=True, forced=True, memo=memo,
+                         ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def trail_edge_elimination_dfs(G, start, memo=None, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _trail_search(G, start, greedy=True, edge_elimination=True, memo=memo,
+                         ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def trail_validation_forced_move_dfs(G, start, memo=None, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _trail_search(G, start, greedy=True, forced=True, validation=True, memo=memo,
+                         ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def trail_validation_edge_elimination_dfs(G, start, memo=None, ordering="degree", tie_break=None, budget=None, stats=None):
+    return _trail_search(G, start, greedy=True, edge_elimination=True, validation=True, memo=memo,
+                         ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+def trail_propagation_dfs(G, start, propagators, memo=None, ordering="warnsdorff", tie_break=None, budget=None, stats=None):
+    return _trail_search(G, start, greedy=ordering is not None, propagators=propagators, memo=memo,
+                         ordering=ordering, tie_break=tie_break, budget=budget, stats=stats)
+
+
+# Enumeration with the pruning of validation_edge_elimination_dfs
+
+def trail_solutions(G, start, ordering="degree", tie_break=None, budget=None):
+    search = TrailSearch(G, start, greedy=True, edge_elimination=True, validation=True,
+                         ordering=ordering, tie_break=tie_break, budget=budget)
+    yield from search.solutions()
+
+
+def trail_count_solutions(G, start, budget=None):
+    search = TrailSearch(G, start, edge_elimination=True, validation=True, budget=budget)
+    return search.count()
@@ -1,22 +1,49 @@
 import os
 import json
 import base64
+import tempfile
 import numpy as np
 import cv2 as cv
-from flask import Flask, render_template_string, request
+from datetime import datetime
+from flask import Flask, render_template_string, request, g, jsonify
 
 # Deployment 
-from src.algo import get_graph_from_binary_matrix, backtracking_dfs, greedy_dfs, forced_move_dfs, edge_elimination_dfs, validation_forced_move_dfs, validation_edge_elimination_dfs
-from src.image import ImageProcessor
+from src.algo import get_grid_from_binary_matrix, backtracking_dfs, greedy_dfs, forced_move_dfs, edge_elimination_dfs, validation_forced_move_dfs, validation_edge_elimination_dfs, propagation_dfs
+from src.budget import Budget
+from src.cache import SolutionCache
+from src.image import ImageProcessor, BoardContext
+from src.portfolio import portfolio_dfs
+from src.profile_dp import profile_dp
+from src.precheck import precheck_board, PRECHECK_MESSAGES
+from src.tracing import Trace, StageStats
 # Local testing
-# from algo import get_graph_from_binary_matrix,  backtracking_dfs, greedy_dfs, forced_move_dfs, edge_elimination_dfs, validation_forced_move_dfs, validation_edge_elimination_dfs
-# from image import ImageProcessor
+# from algo import get_grid_from_binary_matrix, backtracking_dfs, greedy_dfs, forced_move_dfs, edge_elimination_dfs, validation_forced_move_dfs, validation_edge_elimination_dfs, propagation_dfs
+# from budget import Budget
+# from cache import SolutionCache
+# from image import ImageProcessor, BoardContext
+# from portfolio import portfolio_dfs
+# from profile_dp import profile_dp
+# from precheck import precheck_board, PRECHECK_MESSAGES
+# from tracing import Trace, StageStats
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg'}
+app.config['SOLVE_TIME_LIMIT'] = 20         # seconds of search per request
+app.config['SOLVE_NODE_LIMIT'] = None       # expanded states per request, None for no limit
+app.config['SOLUTION_CACHE_PATH'] = os.path.join(tempfile.gettempdir(), 'block_fill_solutions.sqlite3')   # None for memory only
+app.config['SOLUTION_CACHE_MEMORY'] = 256   # boards kept in memory
+app.config['SOLUTION_CACHE_DISK'] = 10000   # boards kept on disk
+app.config['STAGE_STATS_WINDOW'] = 1000    # recent requests kept for stage percentiles
 
 processor = ImageProcessor()
+solution_cache = SolutionCache(app.config['SOLUTION_CACHE_PATH'], max_memory=app.config['SOLUTION_CACHE_MEMORY'],
+                               max_disk=app.config['SOLUTION_CACHE_DISK'])
+stage_stats = StageStats(window=app.config['STAGE_STATS_WINDOW'])
+
+# Algorithms that take no restarts; the form disables the restart mode for them
+NO_RESTARTS = ('backtracking', 'profile')
+NO_RESTARTS_MESSAGE = 'Randomised restarts do not apply to Backtracking DFS or Profile DP; choose another solve mode.'
 
 # Base HTML with placeholder tokens for which sections/buttons are active initially
 BASE_HTML = '''
@@ -463,6 +490,29 @@ BASE_HTML = '''
                             <option value="validation_forced_move" selected>Validation Forced Move</option>
                             <option value="edge_elimination" selected>Edge Elimination</option>
                             <option value="forced_move" selected>Forced Move</option>
+                            <option value="propagation">Edge Elimination + Warnsdorff + Connectivity</option>
+                            <option value="portfolio">Portfolio (race all)</option>
+                            <option value="profile">Profile DP (boards up to 10 wide)</option>
+                        </select>
+                    </div>
+
+                    <div class="form-group">
+                        <label for="engine">Search Engine:</label>
+                        <select id="engine" name="engine">
+                            <option value="graph" selected>Graph (networkx)</option>
+                            <option value="bitboard">Bitboard</option>
+                            <option value="trail">Undo Trail</option>
+                            <option value="lowmem">Low Memory (deep boards)</option>
+                            <option value="parallel">Parallel (multi-core)</option>
+                        </select>
+                    </div>
+
+                    <div class="form-group">
+                        <label for="mode">Solve Mode:</label>
+                        <select id="mode" name="mode">
+                            <option value="whole" selected>Whole Board</option>
+                            <option value="split">Room by Room (split at cut cells)</option>
+                            <option value="restart">Randomised Restarts (Luby schedule)</option>
                         </select>
                     </div>
                     
@@ -520,6 +570,27 @@ BASE_HTML = '''
                                 <option value="validation_forced_move" selected>Validation Forced Move</option>
                                 <option value="edge_elimination" selected>Edge Elimination</option>
                                 <option value="forced_move" selected>Forced Move</option>
+                                <option value="propagation">Edge Elimination + Warnsdorff + Connectivity</option>
+                                <option value="portfolio">Portfolio (race all)</option>
+                                <option value="profile">Profile DP (boards up to 10 wide)</option>
+                            </select>
+                        </div>
+                        <div class="form-group">
+                            <label for="engine2">Search Engine:</label>
+                            <select id="engine2" name="engine">
+                                <option value="graph" selected>Graph (networkx)</option>
+                                <option value="bitboard">Bitboard</option>
+                                <option value="trail">Undo Trail</option>
+                                <option value="lowmem">Low Memory (deep boards)</option>
+                                <option value="parallel">Parallel (multi-core)</option>
+                            </select>
+                        </div>
+                        <div class="form-group">
+                            <label for="mode2">Solve Mode:</label>
+                            <select id="mode2" name="mode">
+                                <option value="whole" selected>Whole Board</option>
+                                <option value="split">Room by Room (split at cut cells)</option>
+                                <option value="restart">Randomised Restarts (Luby schedule)</option>
                             </select>
                         </div>
                         <button type="submit" class="btn" onclick="return submitMatrix()"> Solve Puzzle</button>
@@ -536,6 +607,18 @@ BASE_HTML = '''
                     <strong>Path Length:</strong> {{ path_length }} steps<br>
                     <strong>Algorithm:</strong> {{ algo_used }}<br>
                     <strong>Time Elapsed:</strong> {{time_elapsed}}<br>
+                    {% if portfolio_runs %}
+                    <strong>Solver Times:</strong><br>
+                    {% for name, status, elapsed in portfolio_runs %}
+                    &nbsp;&nbsp;{{ name }}: {{ status }}, {{ elapsed }}<br>
+                    {% endfor %}
+                    {% endif %}
+                    {% if stage_times %}
+                    <strong>Stage Times:</strong><br>
+                    {% for stage, ms in stage_times.items() %}
+                    &nbsp;&nbsp;{{ stage }}: {{ '%.3f' % ms }} ms<br>
+                    {% endfor %}
+                    {% endif %}
                     <strong>Status:</strong> Solution found successfully!
                 </p>
             </div>
@@ -564,6 +647,18 @@ BASE_HTML = '''
                 <p>
                     <strong>Algorithm:</strong> {{ algo_used }}<br>
                     <strong>Time Elapsed:</strong> {{time_elapsed}}<br>
+                    {% if portfolio_runs %}
+                    <strong>Solver Times:</strong><br>
+                    {% for name, status, elapsed in portfolio_runs %}
+                    &nbsp;&nbsp;{{ name }}: {{ status }}, {{ elapsed }}<br>
+                    {% endfor %}
+                    {% endif %}
+                    {% if stage_times %}
+                    <strong>Stage Times:</strong><br>
+                    {% for stage, ms in stage_times.items() %}
+                    &nbsp;&nbsp;{{ stage }}: {{ '%.3f' % ms }} ms<br>
+                    {% endfor %}
+                    {% endif %}
                     <strong>Status:</strong> Solution Not Found!
                 </p>
 
@@ -946,6 +1041,21 @@ BASE_HTML = '''
             return true;
         }
 
+        // Backtracking and Profile DP take no restarts, so their restart mode is disabled
+        const NO_RESTARTS = __NO_RESTARTS__;
+
+        function syncRestartMode(algorithmId, modeId) {
+            const mode = document.getElementById(modeId);
+            const restart = mode.querySelector('option[value="restart"]');
+            restart.disabled = NO_RESTARTS.includes(document.getElementById(algorithmId).value);
+            if (restart.disabled && mode.value === 'restart') mode.value = 'whole';
+        }
+
+        [['algorithm', 'mode'], ['algorithm2', 'mode2']].forEach(([algorithmId, modeId]) => {
+            document.getElementById(algorithmId).addEventListener('change', () => syncRestartMode(algorithmId, modeId));
+            syncRestartMode(algorithmId, modeId);
+        });
+
         window.addEventListener('DOMContentLoaded', () => { restoreGridFromStorage(); });
 
     </script>
@@ -954,6 +1064,8 @@ BASE_HTML = '''
 '''
 
 # Build two concrete templates by replacing tokens:
+BASE_HTML = BASE_HTML.replace('__NO_RESTARTS__', json.dumps(NO_RESTARTS))
+
 IMAGE_TEMPLATE = BASE_HTML.replace('__UPLOAD_ACTIVE__', 'active') \
                             .replace('__MANUAL_ACTIVE__', '') \
                             .replace('__UPLOAD_BTN_ACTIVE__', 'active') \
@@ -972,10 +1084,37 @@ def img_to_datauri_b64(img_ndarray):
     _, buff = cv.imencode('.png', img_ndarray)
     return base64.b64encode(buff).decode('utf-8')
 
+# Per-stage tracing: each POST gets a Trace that the routes lap stage by stage.
+# The spans are shown with the result, sent as a Server-Timing header and
+# added to stage_stats, which /stats reports as p50 / p99 per stage.
+
+@app.before_request
+def start_trace():
+    if request.method == 'POST':
+        g.trace = Trace()
+
+@app.context_processor
+def inject_stage_times():
+    trace = g.get('trace')
+    return {'stage_times': trace.spans if trace else None}
+
+@app.after_request
+def finish_trace(response):
+    trace = g.get('trace')
+    if trace is not None:
+        trace.lap('render')
+        response.headers['Server-Timing'] = trace.server_timing()
+        stage_stats.record(trace)
+    return response
+
 @app.route('/', methods=['GET'])
 def index():
     return render_template_string(IMAGE_TEMPLATE)
 
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify(requests=stage_stats.requests, stages=stage_stats.summary(), solution_cache=solution_cache.stats())
+
 @app.route('/solve_upload', methods=['POST'])
 def solve_upload():
     if 'file' not in request.files:
@@ -983,6 +1122,11 @@ def solve_upload():
     
     file = request.files['file']
     algorithm = request.form.get('algorithm', 'forced_move')
+    engine = request.form.get('engine', 'graph')
+    split = request.form.get('mode', 'whole') == 'split'
+    restarts = 'luby' if request.form.get('mode') == 'restart' else None
+    if restarts and algorithm in NO_RESTARTS:
+        return render_template_string(IMAGE_TEMPLATE, error=NO_RESTARTS_MESSAGE)
     
     if file.filename == '':
         return render_template_string(IMAGE_TEMPLATE, error='No file selected')
@@ -990,53 +1134,106 @@ def solve_upload():
     if file and allowed_file(file.filename):
         try:
             raw = file.read()
-            img = cv.imdecode(np.frombuffer(raw, np.uint8), cv.IMREAD_COLOR)
+            g.trace.lap('read')
 
-            if img is None:
+            # Decodes at reduced size when the cells are large enough, lapping decode and detection apart
+            board = BoardContext()
+            matrix = processor.img_to_matrix(raw, board, lap=g.trace.lap)
+            g.trace.lap('img_to_matrix')
+
+            if matrix is None:
                 return render_template_string(IMAGE_TEMPLATE, error='Could not read uploaded image')
-        
-            matrix = processor.img_to_matrix(img)
 
-            processor.generate_img(matrix)
+            processor.generate_img(matrix, board)
+            g.trace.lap('generate_img')
+
+            # Boards solved before (in any rotation or reflection) skip graph building and search
+            time_start = datetime.now()
+            cached = solution_cache.get(matrix)
+            g.trace.lap('cache')
+            if cached:
+                elapsed_s = (datetime.now() - time_start).total_seconds()
+                result_img = processor.draw_path_on_image(matrix, cached, cached[0], cached[-1], board)
+                g.trace.lap('draw_path')
+                original_b64 = img_to_datauri_b64(board.original_img_bgr)
+                result_b64 = img_to_datauri_b64(result_img)
+                g.trace.lap('encode')
+                return render_template_string(IMAGE_TEMPLATE, original_img=original_b64, result_img=result_b64, path_length=len(cached),
+                                              algo_used='Solution Cache', time_elapsed=f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)",
+                                              success='Puzzle solved successfully!')
 
             # Convert to graph
-            G, start = get_graph_from_binary_matrix(matrix)
+            G, start = get_grid_from_binary_matrix(matrix)
+            g.trace.lap('graph')
             
             if start is None :
                 return render_template_string(IMAGE_TEMPLATE, 
                     error='Could not find start or finish cell. Make sure the image has clear grid structure.')
             
+            # Reject unsolvable boards before searching
+            rejected = precheck_board(G, start)
+            g.trace.lap('precheck')
+            if rejected:
+                original_b64 = img_to_datauri_b64(board.img_bgr)
+                return render_template_string(IMAGE_TEMPLATE, original_img=original_b64, time_elapsed="0.000000 s (0.000 ms)",
+                                              algo_used='Pre-check', path_length=None, result_img=None, NotFound=True,
+                                              error=PRECHECK_MESSAGES[rejected])
+            
             # Run algorithm
+            portfolio_runs = None
+            budget = Budget(time_limit=app.config['SOLVE_TIME_LIMIT'], max_nodes=app.config['SOLVE_NODE_LIMIT'])
             if algorithm == 'backtracking' :
-                path, finish_status, finish_node, time_elapsed = backtracking_dfs(G, start)
+                path, finish_status, finish_node, time_elapsed = backtracking_dfs(G, start, engine=engine, precheck=False, split=split, budget=budget)
                 algo_name = 'Backtracking DFS'
             elif algorithm == 'greedy'  :
-                path, finish_status, finish_node, time_elapsed = greedy_dfs(G, start)
+                path, finish_status, finish_node, time_elapsed = greedy_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
                 algo_name = 'Greedy DFS'
             elif algorithm == 'forced_move' :
-                path, finish_status, finish_node, time_elapsed = forced_move_dfs(G, start)
+                path, finish_status, finish_node, time_elapsed = forced_move_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
                 algo_name = 'Forced Move DFS'
             elif algorithm == 'edge_elimination' :
-                path, finish_status, finish_node, time_elapsed = edge_elimination_dfs(G, start)
+                path, finish_status, finish_node, time_elapsed = edge_elimination_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
                 algo_name = 'Edge Elimination DFS'
             elif algorithm == 'validation_forced_move' :
-                path, finish_status, finish_node, time_elapsed = validation_forced_move_dfs(G, start)
+                path, finish_status, finish_node, time_elapsed = validation_forced_move_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
                 algo_name = 'Validation Forced Move DFS'
             elif algorithm == 'validation_edge_elimination' :
-                path, finish_status, finish_node, time_elapsed = validation_edge_elimination_dfs(G, start)
+                path, finish_status, finish_node, time_elapsed = validation_edge_elimination_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
                 algo_name = 'Validation Edge Elimination DFS'
+            elif algorithm == 'propagation' :
+                path, finish_status, finish_node, time_elapsed = propagation_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
+                algo_name = 'Propagation DFS (edges, dead ends, parity, articulation; Warnsdorff)'
+            elif algorithm == 'portfolio' :
+                report = {}
+                path, finish_status, finish_node, time_elapsed = portfolio_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget, report=report)
+                algo_name = f"Portfolio ({report['winner']} won)" if report['winner'] else 'Portfolio'
+                portfolio_runs = report['runs']
+            elif algorithm == 'profile' :
+                report = {}
+                path, finish_status, finish_node, time_elapsed = profile_dp(matrix, budget=budget, report=report)
+                algo_name = f"Profile DP ({report['count']} solutions)" if report['count'] is not None else 'Profile DP'
             else:
                 return render_template_string(IMAGE_TEMPLATE, error='Unknown algorithm')
+            g.trace.lap('solve')
             
-            original_b64 = img_to_datauri_b64(getattr(processor, 'last_img_bgr', processor.last_img_bgr))
+            original_b64 = img_to_datauri_b64(board.img_bgr)
+            g.trace.lap('encode')
             
             if finish_status is False:
+                message = 'Could not find path from start to finish.'
+                if budget.gave_up:
+                    message = f'Search gave up ({budget.reason}) after {budget.nodes} states, deepest path {budget.max_depth} cells.'
                 return render_template_string(IMAGE_TEMPLATE, original_img=original_b64, time_elapsed=time_elapsed,
-                                              algo_used=algo_name,path_length=None, result_img=None, NotFound=True,
-                                              error='Could not find path from start to finish.')
+                                              algo_used=algo_name,path_length=None, result_img=None, NotFound=True, portfolio_runs=portfolio_runs,
+                                              error=message)
             
-            result_img = processor.draw_path_on_image(matrix, path, start, finish_node)
+            solution_cache.put(matrix, path)
+            g.trace.lap('cache')
+
+            result_img = processor.draw_path_on_image(matrix, path, start, finish_node, board)
+            g.trace.lap('draw_path')
             result_b64 = img_to_datauri_b64(result_img)
+            g.trace.lap('encode')
 
             return render_template_string(IMAGE_TEMPLATE, 
                 original_img=original_b64,
@@ -1044,6 +1241,7 @@ def solve_upload():
                 path_length=len(path),
                 algo_used=algo_name,
                 time_elapsed=time_elapsed,
+                portfolio_runs=portfolio_runs,
                 success='Puzzle solved successfully!')
             
         except Exception as e:
@@ -1056,53 +1254,108 @@ def solve_manual():
     try:
         matrix_json = request.form.get('matrix_data')
         algorithm = request.form.get('algorithm', 'forced_move')
+        engine = request.form.get('engine', 'graph')
+        split = request.form.get('mode', 'whole') == 'split'
+        restarts = 'luby' if request.form.get('mode') == 'restart' else None
+        if restarts and algorithm in NO_RESTARTS:
+            return render_template_string(MANUAL_TEMPLATE, error=NO_RESTARTS_MESSAGE)
         
         if not matrix_json:
             return render_template_string(MANUAL_TEMPLATE, error='No matrix data received')
         
         matrix = np.array(json.loads(matrix_json))
-
-        generated = processor.generate_img(matrix)
-
-        processor.img_to_matrix(generated)
+        g.trace.lap('read')
+
+        board = BoardContext()
+        processor.generate_img(matrix, board)
+        g.trace.lap('generate_img')
+
+        # Boards solved before (in any rotation or reflection) skip graph building and search
+        time_start = datetime.now()
+        cached = solution_cache.get(matrix)
+        g.trace.lap('cache')
+        if cached:
+            elapsed_s = (datetime.now() - time_start).total_seconds()
+            result_img = processor.draw_path_on_image(matrix, cached, cached[0], cached[-1], board)
+            g.trace.lap('draw_path')
+            original_b64 = img_to_datauri_b64(board.original_img_bgr)
+            result_b64 = img_to_datauri_b64(result_img)
+            g.trace.lap('encode')
+            return render_template_string(MANUAL_TEMPLATE, original_img=original_b64, result_img=result_b64, path_length=len(cached),
+                                          algo_used='Solution Cache', time_elapsed=f"{elapsed_s:.6f} s ({elapsed_s*1000:.3f} ms)",
+                                          success='Custom puzzle solved successfully!')
 
         # Convert to graph
-        G, start = get_graph_from_binary_matrix(matrix)
+        G, start = get_grid_from_binary_matrix(matrix)
+        g.trace.lap('graph')
         
         if start is None:
             return render_template_string(MANUAL_TEMPLATE, 
                 error='Could not find start or finish in matrix')
         
+        # Reject unsolvable boards before searching
+        rejected = precheck_board(G, start)
+        g.trace.lap('precheck')
+        if rejected:
+            original_b64 = img_to_datauri_b64(board.img_bgr)
+            return render_template_string(MANUAL_TEMPLATE, original_img=original_b64, time_elapsed="0.000000 s (0.000 ms)",
+                                            algo_used='Pre-check', path_length=None, result_img=None, NotFound=True,
+                                            error=PRECHECK_MESSAGES[rejected])
+        
+        portfolio_runs = None
+        budget = Budget(time_limit=app.config['SOLVE_TIME_LIMIT'], max_nodes=app.config['SOLVE_NODE_LIMIT'])
         if algorithm == 'backtracking' :
-            path, finish_status, finish_node, time_elapsed = backtracking_dfs(G, start)
+            path, finish_status, finish_node, time_elapsed = backtracking_dfs(G, start, engine=engine, precheck=False, split=split, budget=budget)
             algo_name = 'Backtracking DFS'
         elif algorithm == 'greedy'  :
-            path, finish_status, finish_node, time_elapsed = greedy_dfs(G, start)
+            path, finish_status, finish_node, time_elapsed = greedy_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
             algo_name = 'Greedy DFS'
         elif algorithm == 'forced_move' :
-            path, finish_status, finish_node, time_elapsed = forced_move_dfs(G, start)
+            path, finish_status, finish_node, time_elapsed = forced_move_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
             algo_name = 'Forced Move DFS'
         elif algorithm == 'edge_elimination' :
-            path, finish_status, finish_node, time_elapsed = edge_elimination_dfs(G, start)
+            path, finish_status, finish_node, time_elapsed = edge_elimination_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
             algo_name = 'Edge Elimination DFS'
         elif algorithm == 'validation_forced_move' :
-            path, finish_status, finish_node, time_elapsed = validation_forced_move_dfs(G, start)
+            path, finish_status, finish_node, time_elapsed = validation_forced_move_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
             algo_name = 'Validation Forced Move DFS'
         elif algorithm == 'validation_edge_elimination' :
-            path, finish_status, finish_node, time_elapsed = validation_edge_elimination_dfs(G, start)
+            path, finish_status, finish_node, time_elapsed = validation_edge_elimination_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
             algo_name = 'Validation Edge Elimination DFS'
+        elif algorithm == 'propagation' :
+            path, finish_status, finish_node, time_elapsed = propagation_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget)
+            algo_name = 'Propagation DFS (edges, dead ends, parity, articulation; Warnsdorff)'
+        elif algorithm == 'portfolio' :
+            report = {}
+            path, finish_status, finish_node, time_elapsed = portfolio_dfs(G, start, engine=engine, precheck=False, split=split, restarts=restarts, budget=budget, report=report)
+            algo_name = f"Portfolio ({report['winner']} won)" if report['winner'] else 'Portfolio'
+            portfolio_runs = report['runs']
+        elif algorithm == 'profile' :
+            report = {}
+            path, finish_status, finish_node, time_elapsed = profile_dp(matrix, budget=budget, report=report)
+            algo_name = f"Profile DP ({report['count']} solutions)" if report['count'] is not None else 'Profile DP'
         else:
             return render_template_string(IMAGE_TEMPLATE, error='Unknown algorithm')
+        g.trace.lap('solve')
         
-        original_b64 = img_to_datauri_b64(getattr(processor, 'last_img_bgr', processor.last_img_bgr))
+        original_b64 = img_to_datauri_b64(board.img_bgr)
+        g.trace.lap('encode')
         
         if finish_status is False:
+            message = 'Could not find path from start to finish.'
+            if budget.gave_up:
+                message = f'Search gave up ({budget.reason}) after {budget.nodes} states, deepest path {budget.max_depth} cells.'
             return render_template_string(MANUAL_TEMPLATE, original_img=original_b64, time_elapsed=time_elapsed,
-                                            algo_used=algo_name,path_length=None, result_img=None, NotFound=True,
-                                            error='Could not find path from start to finish.')
+                                            algo_used=algo_name,path_length=None, result_img=None, NotFound=True, portfolio_runs=portfolio_runs,
+                                            error=message)
         
-        result_img = processor.draw_path_on_image(matrix, path, start, finish_node)
+        solution_cache.put(matrix, path)
+        g.trace.lap('cache')
+
+        result_img = processor.draw_path_on_image(matrix, path, start, finish_node, board)
+        g.trace.lap('draw_path')
         result_b64 = img_to_datauri_b64(result_img)
+        g.trace.lap('encode')
         
         return render_template_string(MANUAL_TEMPLATE, 
             original_img=original_b64,
@@ -1110,6 +1363,7 @@ def solve_manual():
             path_length=len(path),
             algo_used=algo_name,
             time_elapsed=time_elapsed,
+            portfolio_runs=portfolio_runs,
             success='Custom puzzle solved successfully!')
         
     except Exception as e:
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.algo import get_grid_from_binary_matrix
+from src.benchmark import THREAD_ENGINES, _graph_state
+from src.budget import Budget
+from src.portfolio import SOLVERS
+
+# Solvers keep their state in the call and only read the graph, so one graph
+# can be shared by every thread solving the board.
+
+BOARDS = {
+    "open_4x5": [[2, 1, 1, 1, 1],
+                 [1, 1, 1, 1, 1],
+                 [1, 1, 1, 1, 1],
+                 [1, 1, 1, 1, 1]],
+    "walls_5x6": [[0, 1, 1, 1, 1, 0],
+                  [0, 1, 1, 1, 1, 1],
+                  [1, 1, 1, 1, 1, 1],
+                  [1, 1, 1, 1, 1, 1],
+                  [1, 1, 2, 1, 0, 0]],
+    "unsolvable_3x3": [[2, 1, 1],
+                       [1, 0, 1],
+                       [1, 1, 0]],
+}
+
+ALGORITHMS = ("backtracking", "forced_move", "edge_elimination", "validation_forced_move",
+              "validation_edge_elimination", "propagation")
+
+
+def assert_valid_path(G, start, path):
+    assert path[0] == start
+    assert sorted(path) == sorted(G.nodes())
+    for u, v in zip(path, path[1:]):
+        assert v in set(G.neighbors(u))
+
+
+@pytest.mark.parametrize("networkx", [False, True], ids=["GridGraph", "networkx"])
+@pytest.mark.parametrize("board", sorted(BOARDS))
+def test_threads_share_one_graph(board, networkx):
+    G, start = get_grid_from_binary_matrix(np.array(BOARDS[board]))
+    if networkx:
+        G = G.to_networkx()
+    before = _graph_state(G)
+    jobs = [(algorithm, engine) for algorithm in ALGORITHMS for engine in THREAD_ENGINES] * 4
+
+    def solve(job):
+        algorithm, engine = job
+        return SOLVERS[algorithm][0](G, start, engine=engine, construct=False, budget=Budget(max_nodes=20000))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(solve, jobs))
+
+    solved = {finished for _, finished, _, _ in results}
+    assert solved == {board != "unsolvable_3x3"}
+    for path, finished, finish_node, _ in results:
+        if finished:
+            assert_valid_path(G, start, path)
+            assert finish_node == path[-1]
+    assert _graph_state(G) == before
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.algo import get_grid_from_binary_matrix, greedy_dfs, forced_move_dfs
+from src.decompose import block_chain
+
+# Split mode stitches the blocks of the block-cut tree, so it must notice
+# cells that lie in no chained block.
+
+DISCONNECTED = {
+    "isolated_cell": [[1, 0, 0, 0],
+                      [0, 2, 1, 1],
+                      [1, 1, 1, 1]],
+    "isolated_start": [[1],
+                       [1],
+                       [0],
+                       [2]],
+}
+
+
+@pytest.mark.parametrize("board", sorted(DISCONNECTED))
+def test_disconnected_board_has_no_chain(board):
+    G, start = get_grid_from_binary_matrix(np.array(DISCONNECTED[board]))
+    assert block_chain(G, start) is None
+
+
+@pytest.mark.parametrize("solver", [greedy_dfs, forced_move_dfs])
+@pytest.mark.parametrize("board", sorted(DISCONNECTED))
+def test_split_reports_no_path_on_disconnected_board(board, solver):
+    G, start = get_grid_from_binary_matrix(np.array(DISCONNECTED[board]))
+    path, finished, finish_node, _ = solver(G, start, precheck=False, construct=False, split=True)
+    assert (path, finished, finish_node) == ([], False, None)
+
+
+def test_lone_start_is_its_own_block():
+    G, start = get_grid_from_binary_matrix(np.array([[2]]))
+    assert block_chain(G, start) == [({start}, start, None)]
+    path, finished, _, _ = greedy_dfs(G, start, precheck=False, construct=False, split=True)
+    assert finished and path == [start]
+
+
+def test_split_solves_across_a_cut_cell():
+    mat = np.array([[1, 1, 0, 1, 1],
+                    [2, 1, 1, 1, 1],
+                    [0, 0, 0, 1, 1]])
+    G, start = get_grid_from_binary_matrix(mat)
+    assert len(block_chain(G, start)) > 1
+    path, finished, _, _ = forced_move_dfs(G, start, precheck=False, construct=False, split=True)
+    assert finished
+    assert path[0] == start and sorted(path) == sorted(G.nodes())
+    assert all(v in set(G.neighbors(u)) for u, v in zip(path, path[1:]))